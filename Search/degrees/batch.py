@@ -0,0 +1,368 @@
+"""
+Batch query mode for degrees.
+
+Loads the memory-mapped graph once and answers a stream of name pairs,
+one per line, either tab separated ("Kevin Bacon<TAB>Tom Hanks") or as a
+JSON object with "source" and "target" keys and optional "source_birth"
+and "target_birth" years. Pairs are read from stdin,
+a file, or a local Unix socket, and every answer is written as one JSON
+line in input order. Queries are spread over a process pool; each worker
+maps the same cache file, so the read-only graph lives once in the page
+cache however many workers run. Queries from a file are submitted in
+batches; those from a socket, a terminal or a pipe are answered as they
+arrive, each answer flushed as soon as it and the ones before it are
+ready. Names shared by several people are narrowed by birth year, then
+reported as errors unless a --policy is given to pick one. With --fuzzy,
+an unknown name is replaced by the closest prefix or trigram match from
+lookup.NameIndex, reported as "source_match" or "target_match".
+"""
+import argparse
+import json
+import os
+import queue
+import socketserver
+import stat
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from cache import load_cached, map_graph
+from degrees import POLICIES
+from lookup import NameIndex
+
+# Graph of the current process, set in the parent or by worker_init
+graph = None
+
+# How ambiguous names are settled, one of degrees.POLICIES
+policy = "none"
+
+# Whether unknown names fall back to the closest prefix or fuzzy match
+fuzzy = False
+
+# lookup.NameIndex over the graph's names, built on the first fallback
+name_index = None
+
+
+def worker_init(directory, chosen_policy, use_fuzzy=False):
+    global graph, policy, fuzzy, name_index
+    graph = map_graph(directory)
+    policy = chosen_policy
+    fuzzy = use_fuzzy
+    name_index = None
+
+
+def parse_pair(line):
+    """
+    Returns (source, target, source_birth, target_birth) from an input
+    line, or None if blank. Birth years come only from the optional
+    "source_birth" and "target_birth" keys of a JSON query.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    births = (None, None)
+    if line.startswith("{"):
+        query = json.loads(line)
+        if not isinstance(query, dict):
+            raise ValueError("query is not an object")
+        source, target = query["source"], query["target"]
+        births = (query.get("source_birth"), query.get("target_birth"))
+    else:
+        source, target = line.split("\t")
+    if not isinstance(source, str) or not isinstance(target, str):
+        raise ValueError("names must be strings")
+    for birth in births:
+        if birth is not None and (isinstance(birth, bool) or not isinstance(birth, (str, int))):
+            raise ValueError("birth years must be strings or integers")
+    return source, target, *births
+
+
+def closest_name(name):
+    """
+    Returns the known name best matching an unknown one by prefix or
+    trigram similarity, or None.
+    """
+    global name_index
+    if name_index is None:
+        names = {}
+        for i in range(graph.num_people):
+            names.setdefault(graph.person_names[i].lower(), set()).add(i)
+        name_index = NameIndex(names)
+    for match in name_index.candidates(name, limit=1):
+        return match
+    return None
+
+
+def resolve(name, birth=None):
+    """
+    Returns (person_id, match, error) for a name without asking the user;
+    `match` is the name actually used when a fuzzy fallback replaced it.
+    """
+    match = None
+    indices = graph.indices_for_name(name)
+    if len(indices) == 0 and fuzzy:
+        match = closest_name(name)
+        if match is not None:
+            indices = graph.indices_for_name(match)
+    if len(indices) == 0:
+        return None, None, "Person not found."
+    if len(indices) > 1 or birth is not None:
+        chosen = choose(indices, birth)
+        if chosen is None:
+            born = _born(indices, birth)
+            if not born:
+                return None, match, f"Nobody of that name was born in {birth}."
+            ids = sorted(graph.person_ids[i] for i in born)
+            return None, match, f"Ambiguous name, candidates: {', '.join(ids)}"
+        return graph.person_ids[chosen], match, None
+    return graph.person_ids[indices[0]], match, None
+
+
+def _born(indices, birth):
+    if birth is None:
+        return indices
+    return [i for i in indices if graph.person_births[i] == str(birth)]
+
+
+def choose(indices, birth=None):
+    """
+    Settles an ambiguous name by birth year, if given, then by the current
+    policy, as degrees.choose_person does for the dictionary data.
+    """
+    indices = _born(indices, birth)
+    if len(indices) <= 1:
+        return indices[0] if indices else None
+    by_id = sorted(indices, key=graph.person_ids.__getitem__)
+    if policy == "most_connected":
+        return max(by_id, key=lambda i: len(graph.movies_for_person(i)))
+    elif policy == "first":
+        return by_id[0]
+    return None
+
+
+def answer(pair):
+    """
+    Returns the JSON-serializable answer for one parsed query.
+    """
+    source_name, target_name, source_birth, target_birth = pair
+    response = {"source": source_name, "target": target_name}
+
+    source, match, error = resolve(source_name, source_birth)
+    if match is not None:
+        response["source_match"] = match
+    if error is None:
+        target, match, error = resolve(target_name, target_birth)
+        if match is not None:
+            response["target_match"] = match
+    if error is not None:
+        response["error"] = error
+        return response
+
+    path = graph.shortest_path(source, target)
+    if path is None:
+        response["degrees"] = None
+        response["path"] = None
+    else:
+        response["degrees"] = len(path)
+        response["path"] = [[movie_id, person_id] for movie_id, person_id in path]
+    return response
+
+
+def answer_line(line):
+    try:
+        pair = parse_pair(line)
+    except (ValueError, KeyError):
+        return {"line": line.rstrip("\n"), "error": "Malformed query."}
+    if pair is None:
+        return None
+    try:
+        return answer(pair)
+    except Exception as error:
+        # Keep one bad query from ending the whole run
+        return {"source": pair[0], "target": pair[1], "error": f"Query failed: {error}"}
+
+
+def run(lines, output, pool=None, chunksize=64):
+    """
+    Answers every query line, writing JSON lines to `output` in order.
+    """
+    if pool is None:
+        results = map(answer_line, lines)
+    else:
+        results = pool.map(answer_line, lines, chunksize=chunksize)
+    for result in results:
+        if result is not None:
+            output.write(json.dumps(result) + "\n")
+    output.flush()
+
+
+def stream(lines, output, pool=None, window=1024):
+    """
+    Answers query lines as they arrive, writing and flushing each answer
+    in order as soon as it is ready, with at most `window` queries in
+    the pool at a time.
+    """
+    if pool is None:
+        for line in lines:
+            result = answer_line(line)
+            if result is not None:
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+        return
+
+    # The reader submits queries while a writer thread waits on them in
+    # order. If writing fails (the client went away, the pool broke) the
+    # writer records the error and keeps draining, so the reader is never
+    # left waiting for a slot, and the reader stops at its next line
+    pending = queue.Queue()
+    slots = threading.BoundedSemaphore(window)
+    errors = []
+
+    def write():
+        while True:
+            future = pending.get()
+            if future is None:
+                return
+            try:
+                if errors:
+                    future.cancel()
+                    continue
+                result = future.result()
+                if result is not None:
+                    output.write(json.dumps(result) + "\n")
+                    output.flush()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                slots.release()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        for line in lines:
+            slots.acquire()
+            if errors:
+                slots.release()
+                break
+            pending.put(pool.submit(answer_line, line))
+    finally:
+        pending.put(None)
+        writer.join()
+    if errors:
+        raise errors[0]
+
+
+def is_file(stream):
+    """
+    Returns True if a stream reads from a regular file rather than a
+    terminal, pipe or socket.
+    """
+    try:
+        return stat.S_ISREG(os.fstat(stream.fileno()).st_mode)
+    except (OSError, ValueError):
+        return False
+
+
+def batched(lines, size):
+    """
+    Groups an unbounded stream into lists, so the pool never reads ahead
+    of more than one batch.
+    """
+    lines = iter(lines)
+    while True:
+        batch = list(islice(lines, size))
+        if not batch:
+            return
+        yield batch
+
+
+def serve(path, pool, batch_size):
+    """
+    Answers queries sent over a Unix socket until interrupted.
+    """
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            lines = (line.decode("utf-8") for line in self.rfile)
+            try:
+                stream(lines, _TextWriter(self.wfile), pool, batch_size)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client disconnected before reading every answer
+                pass
+
+    # Replace a socket left by an earlier run, but never any other file
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        mode = None
+    if mode is not None:
+        if not stat.S_ISSOCK(mode):
+            sys.exit(f"{path} exists and is not a socket")
+        os.remove(path)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        print(f"Listening on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    os.remove(path)
+
+
+class _TextWriter():
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        self.stream.write(text.encode("utf-8"))
+
+    def flush(self):
+        self.stream.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer degrees queries in bulk.")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("pairs", nargs="?", help="file of name pairs (default: stdin)")
+    parser.add_argument("--socket", help="serve queries on this Unix socket path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes, 0 to answer in this process")
+    parser.add_argument("--batch", type=int, default=1024,
+                        help="queries submitted to the pool at a time, or "
+                             "in flight at once when streaming")
+    parser.add_argument("--policy", choices=POLICIES, default="none",
+                        help="how to pick among people sharing a name")
+    parser.add_argument("--fuzzy", action="store_true",
+                        help="answer unknown names with the closest known name")
+    args = parser.parse_args()
+
+    global graph, policy, fuzzy
+    policy = args.policy
+    fuzzy = args.fuzzy
+    print("Loading data...", file=sys.stderr)
+    graph = load_cached(args.directory)
+    print("Data loaded.", file=sys.stderr)
+
+    pool = None
+    if args.workers:
+        pool = ProcessPoolExecutor(args.workers, initializer=worker_init,
+                                   initargs=(args.directory, args.policy, args.fuzzy))
+    try:
+        if args.socket:
+            serve(args.socket, pool, args.batch)
+        elif args.pairs:
+            with open(args.pairs, encoding="utf-8") as f:
+                for batch in batched(f, args.batch):
+                    run(batch, sys.stdout, pool)
+        elif is_file(sys.stdin):
+            for batch in batched(sys.stdin, args.batch):
+                run(batch, sys.stdout, pool)
+        else:
+            stream(sys.stdin, sys.stdout, pool, args.batch)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
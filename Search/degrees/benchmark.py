@@ -0,0 +1,66 @@
+"""
+Compares single-direction and bidirectional breadth-first search
+on random pairs of people from a degrees dataset.
+"""
+import random
+import sys
+import time
+
+import degrees
+
+
+def time_search(search, pairs, engine):
+    """
+    Runs `search` over every pair, returning elapsed seconds, path lengths
+    and the total number of people expanded.
+    """
+    lengths = []
+    expanded = 0
+    start = time.perf_counter()
+    for source, target in pairs:
+        path = search(source, target)
+        lengths.append(None if path is None else len(path))
+        expanded += engine.nodes_expanded
+    return time.perf_counter() - start, lengths, expanded
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python benchmark.py [directory] [pairs]")
+    directory = sys.argv[1] if len(sys.argv) >= 2 else "large"
+    count = int(sys.argv[2]) if len(sys.argv) == 3 else 20
+
+    print("Loading data...")
+    degrees.load_data(directory)
+    print("Data loaded.")
+
+    rng = random.Random(0)
+    ids = sorted(degrees.people)
+    pairs = [(rng.choice(ids), rng.choice(ids)) for _ in range(count)]
+
+    # Each search starts from an empty co-star cache, so neither is timed
+    # against the expansions the other one left behind
+    engine = degrees.PathSearch()
+    degrees.costar_cache.clear()
+    single_time, single_lengths, single_expanded = time_search(
+        engine.shortest_path, pairs, engine)
+    single_cache = degrees.costar_cache.stats()
+    degrees.costar_cache.clear()
+    bi_time, bi_lengths, bi_expanded = time_search(
+        engine.shortest_path_bidirectional, pairs, engine)
+    bi_cache = degrees.costar_cache.stats()
+
+    if single_lengths != bi_lengths:
+        sys.exit("Searches disagree on path lengths.")
+
+    print(f"Pairs: {count}")
+    print(f"Single direction: {single_time:.3f}s, {single_expanded} expanded")
+    print(f"Bidirectional:    {bi_time:.3f}s, {bi_expanded} expanded")
+    if bi_time > 0:
+        print(f"Speedup:          {single_time / bi_time:.1f}x")
+    print(f"Cache, single:    {single_cache}")
+    print(f"Cache, bidir:     {bi_cache}")
+
+
+if __name__ == "__main__":
+    main()
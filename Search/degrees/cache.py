@@ -0,0 +1,193 @@
+"""
+Binary cache for the compact degrees Graph.
+
+The first run compiles the CSV files into `graph.bin` inside the data
+directory. Later runs memory-map that file, so every buffer of the Graph is
+a view onto the page cache and startup does no parsing at all. The header
+records the mtime and size of each source CSV, and a stale cache is
+rebuilt automatically.
+"""
+import mmap
+import os
+import struct
+import sys
+import time
+
+from graph import INDEX, Graph, StringTable, load_graph
+
+MAGIC = b"DEGREES\x02"
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+CACHE_NAME = "graph.bin"
+
+# Order in which buffers are written after the header
+STRING_TABLES = (
+    "person_ids", "person_names", "person_births",
+    "movie_ids", "movie_titles", "movie_years",
+)
+INDEX_ARRAYS = (
+    "person_offsets", "person_movies", "movie_offsets", "movie_people",
+    "person_id_order", "person_name_order", "movie_id_order",
+)
+NUM_BUFFERS = 2 * len(STRING_TABLES) + len(INDEX_ARRAYS)
+
+# Magic, then (mtime_ns, size) per source, then (offset, length) per buffer
+HEADER = struct.Struct("<8s" + "qq" * len(SOURCES) + "qq" * NUM_BUFFERS)
+ALIGNMENT = 8
+
+
+def cache_path(directory):
+    return os.path.join(directory, CACHE_NAME)
+
+
+def fingerprint(directory):
+    """
+    Returns (mtime_ns, size) for each source CSV file.
+    """
+    stamps = []
+    for name in SOURCES:
+        stat = os.stat(os.path.join(directory, name))
+        stamps.append((stat.st_mtime_ns, stat.st_size))
+    return stamps
+
+
+def _buffers(graph):
+    for name in STRING_TABLES:
+        table = getattr(graph, name)
+        yield bytes(table.blob)
+        yield bytes(table.offsets)
+    for name in INDEX_ARRAYS:
+        yield bytes(getattr(graph, name))
+
+
+def compile_graph(directory, graph=None):
+    """
+    Writes the Graph for `directory` to its binary cache file.
+    """
+    stamps = fingerprint(directory)
+    if graph is None:
+        graph = load_graph(directory)
+
+    sections = []
+    position = HEADER.size
+    payload = []
+    for data in _buffers(graph):
+        padding = -position % ALIGNMENT
+        payload.append(b"\0" * padding)
+        position += padding
+        sections.append((position, len(data)))
+        payload.append(data)
+        position += len(data)
+
+    fields = [MAGIC]
+    for stamp in stamps:
+        fields.extend(stamp)
+    for section in sections:
+        fields.extend(section)
+
+    # Write to a temporary file first so readers never see a partial cache
+    path = cache_path(directory)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(*fields))
+        for data in payload:
+            f.write(data)
+    os.replace(temporary, path)
+    return graph
+
+
+def _read_header(data):
+    if len(data) < HEADER.size:
+        return None
+    fields = HEADER.unpack_from(data)
+    if fields[0] != MAGIC:
+        return None
+    values = fields[1:]
+    count = 2 * len(SOURCES)
+    stamps = [tuple(values[i:i + 2]) for i in range(0, count, 2)]
+    sections = [tuple(values[i:i + 2]) for i in range(count, len(values), 2)]
+    return stamps, sections
+
+
+def is_fresh(directory):
+    """
+    Returns True if the cache exists and matches the current CSV files.
+    """
+    try:
+        with open(cache_path(directory), "rb") as f:
+            header = _read_header(f.read(HEADER.size))
+    except OSError:
+        return False
+    return header is not None and header[0] == fingerprint(directory)
+
+
+def map_graph(directory):
+    """
+    Memory-maps the cache file of `directory` as a Graph, or returns None
+    if it is missing or stale.
+    """
+    try:
+        f = open(cache_path(directory), "rb")
+    except OSError:
+        return None
+    with f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            return None
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    header = _read_header(mapped)
+    if header is None or header[0] != fingerprint(directory):
+        mapped.close()
+        return None
+
+    view = memoryview(mapped)
+    buffers = [view[offset:offset + length] for offset, length in header[1]]
+
+    tables = {}
+    for i, name in enumerate(STRING_TABLES):
+        blob, offsets = buffers[2 * i], buffers[2 * i + 1]
+        tables[name] = StringTable(blob, offsets.cast(INDEX))
+    arrays = {
+        name: buffer.cast(INDEX)
+        for name, buffer in zip(INDEX_ARRAYS, buffers[2 * len(STRING_TABLES):])
+    }
+
+    graph = Graph(**tables, **arrays)
+    # Keep the mapping alive for as long as the graph views it
+    graph._mmap = mapped
+    return graph
+
+
+def load_cached(directory):
+    """
+    Returns the Graph for `directory`, compiling the cache first
+    if it is missing or out of date.
+    """
+    graph = map_graph(directory)
+    if graph is None:
+        compile_graph(directory)
+        graph = map_graph(directory)
+    return graph
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python cache.py [directory]")
+    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+
+    if is_fresh(directory):
+        print("Cache is up to date.")
+    else:
+        print("Compiling cache...")
+        start = time.perf_counter()
+        compile_graph(directory)
+        print(f"Compiled in {time.perf_counter() - start:.1f}s.")
+
+    start = time.perf_counter()
+    graph = map_graph(directory)
+    elapsed = time.perf_counter() - start
+    print(f"Mapped {graph.num_people} people and {graph.num_movies} movies "
+          f"in {elapsed * 1000:.1f}ms.")
+
+
+if __name__ == "__main__":
+    main()
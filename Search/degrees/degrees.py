@@ -1,7 +1,9 @@
 import csv
+import os
 import sys
+import time
 
-from util import Node, QueueFrontier
+from util import LRUCache, Node, QueueFrontier
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -12,12 +14,38 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
-solution = []
+# Rough cost of one (movie_id, person_id) pair held in a cached neighbor set
+PAIR_BYTES = sys.getsizeof((None, None)) + 8
+
+
+def neighbors_size(neighbors):
+    return sys.getsizeof(neighbors) + len(neighbors) * PAIR_BYTES
+
+
+# Default memory cap of each neighbor cache, changed with set_cache_limit
+CACHE_BYTES = 256 * 2**20
+
+# Neighbor expansions of recently searched people, keyed by person_id
+neighbor_cache = LRUCache(max_bytes=CACHE_BYTES, sizeof=neighbors_size)
+costar_cache = LRUCache(max_bytes=CACHE_BYTES, sizeof=neighbors_size)
+
+
+def set_cache_limit(max_bytes):
+    """
+    Caps each neighbor cache at `max_bytes`, evicting right away
+    whatever no longer fits.
+    """
+    neighbor_cache.resize(max_bytes)
+    costar_cache.resize(max_bytes)
+
 
 def load_data(directory):
     """
     Load data from CSV files into memory.
     """
+    neighbor_cache.clear()
+    costar_cache.clear()
+
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
@@ -54,26 +82,58 @@ def load_data(directory):
 
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    args = sys.argv[1:]
+    options = {arg for arg in args if arg.startswith("--")}
+    args = [arg for arg in args if not arg.startswith("--")]
+    if len(args) > 1 or options - {"--bidirectional", "--cached", "--progress", "--parallel"}:
+        sys.exit("Usage: python degrees.py [--bidirectional] [--cached] "
+                 "[--progress] [--parallel] [directory]")
+    if "--cached" in options and options & {"--bidirectional", "--progress", "--parallel"}:
+        # The compiled graph is mapped, not parsed, and only searches forwards
+        sys.exit("--cached cannot be combined with --bidirectional, "
+                 "--progress or --parallel")
+    directory = args[0] if len(args) == 1 else "large"
 
-    # Load data from files into memory
-    print("Loading data...")
-    load_data(directory)
-    print("Data loaded.")
+    if "--cached" in options:
+        # Memory-map the compiled graph instead of parsing the CSV files
+        from cache import load_cached
+        print("Loading data...")
+        graph = load_cached(directory)
+        print("Data loaded.")
+        find_person = graph.person_id_for_name
+        search = graph.shortest_path
+        name_for_person = graph.name_for_person
+        title_for_movie = graph.title_for_movie
+    else:
+        # Load data from files into memory
+        print("Loading data...")
+        if "--parallel" in options or "--progress" in options:
+            import loader
+            workers = os.cpu_count() if "--parallel" in options else 0
+            # Fill this module, which is __main__ when run as a script
+            loader.load_data(directory, workers=workers, data=sys.modules[__name__])
+        else:
+            load_data(directory)
+        print("Data loaded.")
+        find_person = person_id_for_name
+        if "--bidirectional" in options:
+            search = shortest_path_bidirectional
+        else:
+            search = shortest_path
+        name_for_person = lambda person_id: people[person_id]["name"]
+        title_for_movie = lambda movie_id: movies[movie_id]["title"]
 
-    source = person_id_for_name(input("Name: "))
+    source = find_person(input("Name: "))
     
     if source is None:
         sys.exit("Person not found.")
         
-    target = person_id_for_name(input("Name: "))
+    target = find_person(input("Name: "))
     
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    path = search(source, target)
     print(f'\n{path}\n')
     
     if path is None:
@@ -83,12 +143,144 @@ def main():
         print(f"{degrees} degrees of separation.")
         path = [(None, source)] + path
         for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
+            person1 = name_for_person(path[i][1])
+            person2 = name_for_person(path[i + 1][1])
+            movie = title_for_movie(path[i + 1][0])
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
+class PathSearch():
+    """
+    Re-entrant shortest path search between two people.
+
+    Each call keeps its state local, so one engine can answer any number of
+    queries. Statistics of the last search are kept on the engine:
+    `nodes_expanded` (people whose co-stars were listed), `nodes_generated`
+    (people added to the frontier) and `elapsed` (wall time in seconds).
+    """
+
+    def __init__(self, neighbors=None):
+        # Function listing (movie_id, person_id) pairs for a person
+        self.neighbors = neighbors if neighbors is not None else costars_for_person
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.elapsed = 0.0
+
+    def shortest_path(self, source, target):
+        """
+        Breadth-first search from the source, testing for the goal as soon
+        as a person is generated rather than when it is removed.
+        """
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        started = time.perf_counter()
+        try:
+            return self._breadth_first(source, target)
+        finally:
+            self.elapsed = time.perf_counter() - started
+
+    def _breadth_first(self, source, target):
+        if source == target:
+            return []
+
+        start = Node(state=source, parent=None, action=None)
+        frontier = QueueFrontier()
+        frontier.add(start)
+        explored = {source}
+
+        while not frontier.empty():
+            node = frontier.remove()
+            self.nodes_expanded += 1
+
+            for movie, person_id in self.neighbors(node.state):
+                if person_id in explored:
+                    continue
+                child = Node(state=person_id, parent=node, action=movie)
+                self.nodes_generated += 1
+                if person_id == target:
+                    return self._backtrack(child)
+                explored.add(person_id)
+                frontier.add(child)
+
+        return None
+
+    @staticmethod
+    def _backtrack(node):
+        # Follow parent nodes to find solution
+        path = []
+        while node.parent is not None:
+            path.append((node.action, node.state))
+            node = node.parent
+        path.reverse()
+        return path
+
+    def shortest_path_bidirectional(self, source, target):
+        """
+        Grows one breadth-first frontier from each end until they meet.
+        """
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        started = time.perf_counter()
+        try:
+            return self._bidirectional(source, target)
+        finally:
+            self.elapsed = time.perf_counter() - started
+
+    def _bidirectional(self, source, target):
+        if source == target:
+            return []
+
+        # Maps each reached person to (movie_id, neighbor towards the root, depth)
+        forward = {source: (None, None, 0)}
+        backward = {target: (None, None, 0)}
+        forward_layer = [source]
+        backward_layer = [target]
+
+        while forward_layer and backward_layer:
+
+            # Always expand the smaller layer, it is the cheaper side to grow
+            if len(forward_layer) <= len(backward_layer):
+                layer, reached, other = forward_layer, forward, backward
+            else:
+                layer, reached, other = backward_layer, backward, forward
+
+            # Finish the whole layer so the best meeting point is kept
+            meeting = None
+            best = None
+            next_layer = []
+            for person in layer:
+                self.nodes_expanded += 1
+                depth = reached[person][2] + 1
+                for movie, neighbor in self.neighbors(person):
+                    if neighbor in reached:
+                        continue
+                    self.nodes_generated += 1
+                    reached[neighbor] = (movie, person, depth)
+                    next_layer.append(neighbor)
+                    if neighbor in other:
+                        total = depth + other[neighbor][2]
+                        if best is None or total < best:
+                            best = total
+                            meeting = neighbor
+
+            if meeting is not None:
+                return _join_paths(forward, backward, meeting)
+
+            if reached is forward:
+                forward_layer = next_layer
+            else:
+                backward_layer = next_layer
+
+        return None
+
+    def stats(self):
+        return {
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "elapsed": self.elapsed,
+        }
+
+
 def shortest_path(source, target):
     """
     Returns the shortest list of (movie_id, person_id) pairs
@@ -96,53 +288,93 @@ def shortest_path(source, target):
 
     If no possible path, returns None.
     """
-    
-    start = Node(state= source, parent=None, action= None)
-    frontier = QueueFrontier()
-    frontier.add(start)
-    
-    explored = set()
-    
-    while True:
-        
-        if frontier.empty():
-            raise Exception("no solution")
-        
-        node = frontier.remove()
-        
-        
-        if node.state == target:
-            
-            # Follow parent nodes to find solution
-            while node.parent is not None:
-                solution.append((node.action, node.state))
-                
-                node = node.parent
-                
-            solution.reverse()
-            return solution
-        
-        explored.add(node.state)
-        
-        
-        for movie, person_id in neighbors_for_person(node.state):
-             
-            if not frontier.contains_state(person_id) and person_id not in explored:
-                    child = Node(state=person_id, parent=node, action=movie)
-                    frontier.add(child) 
-        
+    return PathSearch().shortest_path(source, target)
+
 
-    return solution
+def shortest_path_bidirectional(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, growing one breadth-first
+    frontier from each end until they meet.
 
+    If no possible path, returns None.
+    """
+    return PathSearch().shortest_path_bidirectional(source, target)
 
-def person_id_for_name(name):
+
+def single_source(source, max_depth=None):
+    """
+    Runs one breadth-first search from `source` over everyone reachable,
+    stopping after `max_depth` degrees if given.
+
+    Returns (distances, parents): distances maps person_id to degrees of
+    separation, parents maps each person_id other than the source to the
+    (movie_id, person_id) pair it was reached through.
+    """
+    distances = {}
+    parents = {}
+    for person_id, distance, movie_id, parent in reachable(source, max_depth):
+        distances[person_id] = distance
+        if parent is not None:
+            parents[person_id] = (movie_id, parent)
+    return distances, parents
+
+
+def reachable(source, max_depth=None):
+    """
+    Yields (person_id, distance, movie_id, parent_id) for every person
+    reachable from `source`, in breadth-first order. The source itself
+    comes first, with no movie or parent.
+    """
+    seen = {source}
+    yield source, 0, None, None
+    layer = [source]
+    depth = 0
+    while layer and (max_depth is None or depth < max_depth):
+        depth += 1
+        next_layer = []
+        for person in layer:
+            for movie, neighbor in costars_for_person(person):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    next_layer.append(neighbor)
+                    yield neighbor, depth, movie, person
+        layer = next_layer
+
+
+def _join_paths(forward, backward, meeting):
+    """
+    Joins the two half paths of a bidirectional search at `meeting`.
+    """
+    path = []
+    person = meeting
+    while forward[person][1] is not None:
+        movie, previous, _ = forward[person]
+        path.append((movie, person))
+        person = previous
+    path.reverse()
+
+    person = meeting
+    while backward[person][1] is not None:
+        movie, following, _ = backward[person]
+        path.append((movie, following))
+        person = following
+    return path
+
+
+def person_id_for_name(name, policy=None, birth=None):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
+
+    Without a `policy` the user is asked which person was meant. With one,
+    the choice is made by choose_person and never blocks on input.
     """
     person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
         return None
+    elif len(person_ids) > 1 and policy is not None:
+        return choose_person(person_ids, policy, birth)
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
         for person_id in person_ids:
@@ -161,17 +393,71 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+# Non-interactive ways of picking one person among several with one name
+POLICIES = ("most_connected", "first", "none")
+
+
+def choose_person(person_ids, policy="most_connected", birth=None):
+    """
+    Picks one of several person_ids without asking the user.
+
+    If `birth` is given, only people born that year are considered.
+    "most_connected" prefers whoever starred in the most movies,
+    "first" takes the lowest id, and "none" gives up on any tie.
+    Returns None when nobody is left or the policy cannot decide.
+    """
+    if birth is not None:
+        person_ids = [
+            person_id for person_id in person_ids
+            if people[person_id]["birth"] == str(birth)
+        ]
+    if len(person_ids) <= 1:
+        return person_ids[0] if person_ids else None
+
+    if policy == "most_connected":
+        return max(
+            sorted(person_ids),
+            key=lambda person_id: len(people[person_id]["movies"])
+        )
+    elif policy == "first":
+        return min(person_ids)
+    elif policy == "none":
+        return None
+    raise ValueError(f"unknown policy: {policy}")
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
+    return neighbor_cache.get(person_id, _neighbors_for_person)
+
+
+def _neighbors_for_person(person_id):
     movie_ids = people[person_id]["movies"]
     neighbors = set()
     for movie_id in movie_ids:
         for person_id in movies[movie_id]["stars"]:
             neighbors.add((movie_id, person_id))
-    return neighbors
+    return frozenset(neighbors)
+
+
+def costars_for_person(person_id):
+    """
+    Returns (movie_id, person_id) pairs with each co-star of a given person
+    listed once, through one representative movie they share.
+    """
+    return costar_cache.get(person_id, _costars_for_person)
+
+
+def _costars_for_person(person_id):
+    costars = {}
+    for movie_id in people[person_id]["movies"]:
+        for costar in movies[movie_id]["stars"]:
+            if costar != person_id and costar not in costars:
+                costars[costar] = movie_id
+    return tuple((movie_id, costar) for costar, movie_id in costars.items())
 
 
 if __name__ == "__main__":
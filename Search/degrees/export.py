@@ -0,0 +1,84 @@
+"""
+Exports degrees of separation from one person to everyone reachable,
+as CSV or Parquet, so distances from hub actors can be precomputed.
+"""
+import argparse
+import csv
+import sys
+
+import degrees
+
+COLUMNS = ["person_id", "name", "distance", "movie_id", "parent_id"]
+
+
+def rows(source, max_depth=None):
+    """
+    Yields one export row per reachable person, in breadth-first order.
+    """
+    for person_id, distance, movie_id, parent in degrees.reachable(source, max_depth):
+        name = degrees.people[person_id]["name"]
+        yield [person_id, name, distance, movie_id, parent]
+
+
+def write_csv(rows, filename):
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+
+
+def write_parquet(rows, filename, batch_size=65536):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        sys.exit("Parquet export requires pyarrow: pip install pyarrow")
+
+    schema = pa.schema([
+        ("person_id", pa.string()),
+        ("name", pa.string()),
+        ("distance", pa.int32()),
+        ("movie_id", pa.string()),
+        ("parent_id", pa.string()),
+    ])
+    with pq.ParquetWriter(filename, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                writer.write_table(_table(pa, schema, batch))
+                batch = []
+        if batch:
+            writer.write_table(_table(pa, schema, batch))
+
+
+def _table(pa, schema, batch):
+    columns = [list(column) for column in zip(*batch)]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export distances from one person.")
+    parser.add_argument("name", help="name of the source person")
+    parser.add_argument("output", help="output file, .csv or .parquet")
+    parser.add_argument("--directory", default="large")
+    parser.add_argument("--max-depth", type=int, default=None)
+    args = parser.parse_args()
+
+    print("Loading data...")
+    degrees.load_data(args.directory)
+    print("Data loaded.")
+
+    source = degrees.person_id_for_name(args.name)
+    if source is None:
+        sys.exit("Person not found.")
+
+    if args.output.endswith(".parquet"):
+        write_parquet(rows(source, args.max_depth), args.output)
+    else:
+        write_csv(rows(source, args.max_depth), args.output)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Compact graph for the degrees dataset.
+
+People and movies are interned to dense integers, and the star relation is
+kept as two compressed-sparse-row (CSR) adjacencies built on `array`
+buffers: person -> movies and movie -> people. Strings are packed into one
+UTF-8 blob per column instead of one Python object per value.
+"""
+import csv
+import sys
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left
+
+# Integer type used for every index buffer
+INDEX = "i"
+
+
+class StringTable():
+    """
+    Immutable list of strings stored as one UTF-8 blob plus offsets.
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings):
+        offsets = array(INDEX, [0])
+        parts = []
+        position = 0
+        for string in strings:
+            data = string.encode("utf-8")
+            parts.append(data)
+            position += len(data)
+            offsets.append(position)
+        return cls(b"".join(parts), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+
+class Graph():
+    """
+    People and movies indexed by dense integers, with CSR adjacency.
+    """
+
+    def __init__(self, person_ids, person_names, person_births,
+                 movie_ids, movie_titles, movie_years,
+                 person_offsets, person_movies, movie_offsets, movie_people,
+                 person_id_order, person_name_order, movie_id_order):
+        self.person_ids = person_ids
+        self.person_names = person_names
+        self.person_births = person_births
+        self.movie_ids = movie_ids
+        self.movie_titles = movie_titles
+        self.movie_years = movie_years
+
+        # CSR adjacency: row i spans offsets[i]:offsets[i + 1]
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_people = movie_people
+
+        # Person indices sorted by id and by lowercase name, and movie
+        # indices sorted by id, for bisection
+        self.person_id_order = person_id_order
+        self.person_name_order = person_name_order
+        self.movie_id_order = movie_id_order
+
+    @property
+    def num_people(self):
+        return len(self.person_ids)
+
+    @property
+    def num_movies(self):
+        return len(self.movie_ids)
+
+    def person_index(self, person_id):
+        """
+        Returns the integer index of an IMDB person id, or None.
+        """
+        order = self.person_id_order
+        i = bisect_left(order, person_id, key=self.person_ids.__getitem__)
+        if i < len(order) and self.person_ids[order[i]] == person_id:
+            return order[i]
+        return None
+
+    def movie_index(self, movie_id):
+        """
+        Returns the integer index of an IMDB movie id, or None.
+        """
+        order = self.movie_id_order
+        i = bisect_left(order, movie_id, key=self.movie_ids.__getitem__)
+        if i < len(order) and self.movie_ids[order[i]] == movie_id:
+            return order[i]
+        return None
+
+    def indices_for_name(self, name):
+        """
+        Returns the indices of every person with the given name,
+        compared case-insensitively.
+        """
+        name = name.lower()
+        order = self.person_name_order
+        key = self._lower_name
+        i = bisect_left(order, name, key=key)
+        found = []
+        while i < len(order) and key(order[i]) == name:
+            found.append(order[i])
+            i += 1
+        return found
+
+    def person_id_for_name(self, name):
+        """
+        Returns the IMDB id for a person's name,
+        resolving ambiguities as needed.
+        """
+        indices = self.indices_for_name(name)
+        if len(indices) == 0:
+            return None
+        elif len(indices) > 1:
+            print(f"Which '{name}'?")
+            for i in indices:
+                print(f"ID: {self.person_ids[i]}, Name: {self.person_names[i]}, "
+                      f"Birth: {self.person_births[i]}")
+            try:
+                person_id = input("Intended Person ID: ")
+                if person_id in [self.person_ids[i] for i in indices]:
+                    return person_id
+            except ValueError:
+                pass
+            return None
+        else:
+            return self.person_ids[indices[0]]
+
+    def name_for_person(self, person_id):
+        return self.person_names[self.person_index(person_id)]
+
+    def title_for_movie(self, movie_id):
+        return self.movie_titles[self.movie_index(movie_id)]
+
+    def _lower_name(self, i):
+        return self.person_names[i].lower()
+
+    def movies_for_person(self, person):
+        return self.person_movies[self.person_offsets[person]:self.person_offsets[person + 1]]
+
+    def people_for_movie(self, movie):
+        return self.movie_people[self.movie_offsets[movie]:self.movie_offsets[movie + 1]]
+
+    def neighbors_for_person(self, person):
+        """
+        Returns (movie, person) index pairs for people
+        who starred with a given person.
+        """
+        neighbors = set()
+        for movie in self.movies_for_person(person):
+            for star in self.people_for_movie(movie):
+                neighbors.add((movie, star))
+        return neighbors
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target, given as IMDB ids.
+
+        If no possible path, returns None.
+        """
+        start = self.person_index(source)
+        goal = self.person_index(target)
+        if start is None or goal is None:
+            return None
+
+        path = self.shortest_index_path(start, goal)
+        if path is None:
+            return None
+        return [(self.movie_ids[movie], self.person_ids[person])
+                for movie, person in path]
+
+    def shortest_index_path(self, start, goal):
+        """
+        Breadth-first search over person indices.
+
+        Returns a list of (movie, person) index pairs, or None.
+        """
+        if start == goal:
+            return []
+
+        # Parent person and connecting movie for every reached person
+        parent = array(INDEX, [-1]) * self.num_people
+        via = array(INDEX, [-1]) * self.num_people
+        parent[start] = start
+        seen_movie = bytearray(self.num_movies)
+
+        layer = [start]
+        while layer:
+            next_layer = []
+            for person in layer:
+                for movie in self.movies_for_person(person):
+                    if seen_movie[movie]:
+                        continue
+                    seen_movie[movie] = 1
+                    for star in self.people_for_movie(movie):
+                        if parent[star] != -1:
+                            continue
+                        parent[star] = person
+                        via[star] = movie
+                        if star == goal:
+                            return self._backtrack(parent, via, start, goal)
+                        next_layer.append(star)
+            layer = next_layer
+        return None
+
+    @staticmethod
+    def _backtrack(parent, via, start, goal):
+        path = []
+        person = goal
+        while person != start:
+            path.append((via[person], person))
+            person = parent[person]
+        path.reverse()
+        return path
+
+
+def _csr(rows, cols, num_rows):
+    """
+    Builds deduplicated, sorted CSR offsets and columns from edge lists.
+    """
+    offsets = array(INDEX, [0]) * (num_rows + 1)
+    for row in rows:
+        offsets[row + 1] += 1
+    for i in range(num_rows):
+        offsets[i + 1] += offsets[i]
+
+    columns = array(INDEX, [0]) * len(rows)
+    fill = array(INDEX, offsets[:-1])
+    for row, col in zip(rows, cols):
+        columns[fill[row]] = col
+        fill[row] += 1
+
+    # Drop duplicate edges, as the set-based loader does
+    compact = array(INDEX)
+    compact_offsets = array(INDEX, [0])
+    for i in range(num_rows):
+        compact.extend(sorted(set(columns[offsets[i]:offsets[i + 1]])))
+        compact_offsets.append(len(compact))
+    return compact_offsets, compact
+
+
+def _order(table, key=None):
+    """
+    Returns indices of a StringTable sorted by (optionally transformed) value.
+    """
+    values = [table[i] for i in range(len(table))]
+    if key is not None:
+        values = [key(value) for value in values]
+    return array(INDEX, sorted(range(len(values)), key=values.__getitem__))
+
+
+def load_graph(directory):
+    """
+    Load data from CSV files into a compact Graph.
+    """
+    # Load people
+    ids, names, births = [], [], []
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            ids.append(row["id"])
+            names.append(row["name"])
+            births.append(row["birth"])
+    person_index = {person_id: i for i, person_id in enumerate(ids)}
+    person_ids = StringTable.from_strings(ids)
+    person_names = StringTable.from_strings(names)
+    person_births = StringTable.from_strings(births)
+    del ids, names, births
+
+    # Load movies
+    ids, titles, years = [], [], []
+    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            ids.append(row["id"])
+            titles.append(row["title"])
+            years.append(row["year"])
+    movie_index = {movie_id: i for i, movie_id in enumerate(ids)}
+    movie_ids = StringTable.from_strings(ids)
+    movie_titles = StringTable.from_strings(titles)
+    movie_years = StringTable.from_strings(years)
+    del ids, titles, years
+
+    # Load stars
+    star_people = array(INDEX)
+    star_movies = array(INDEX)
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            person = person_index.get(row["person_id"])
+            movie = movie_index.get(row["movie_id"])
+            if person is None or movie is None:
+                continue
+            star_people.append(person)
+            star_movies.append(movie)
+    del person_index, movie_index
+
+    person_offsets, person_movies = _csr(star_people, star_movies, len(person_ids))
+    movie_offsets, movie_people = _csr(star_movies, star_people, len(movie_ids))
+
+    graph = Graph(
+        person_ids, person_names, person_births,
+        movie_ids, movie_titles, movie_years,
+        person_offsets, person_movies, movie_offsets, movie_people,
+        _order(person_ids), _order(person_names, key=str.lower), _order(movie_ids),
+    )
+    return graph
+
+
+def measure(load, directory):
+    """
+    Returns (result, seconds, bytes held) for a loader call.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load(directory)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python graph.py [directory]")
+    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+
+    import degrees
+
+    _, dict_time, dict_bytes = measure(degrees.load_data, directory)
+    print(f"Dict loader:  {dict_bytes / 2**20:8.1f} MiB in {dict_time:.1f}s")
+
+    graph, csr_time, csr_bytes = measure(load_graph, directory)
+    print(f"Graph loader: {csr_bytes / 2**20:8.1f} MiB in {csr_time:.1f}s")
+    print(f"People: {graph.num_people}, movies: {graph.num_movies}, "
+          f"stars: {len(graph.person_movies)}")
+
+
+if __name__ == "__main__":
+    main()
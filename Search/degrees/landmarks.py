@@ -0,0 +1,196 @@
+"""
+Landmark distance oracle for degrees.
+
+A handful of well-connected people are picked as landmarks, and one
+breadth-first search from each records everyone's distance to it. By the
+triangle inequality, for any landmark L:
+
+    |d(s, L) - d(L, t)| <= d(s, t) <= d(s, L) + d(L, t)
+
+so bounds on any degree of separation take K lookups. The same bounds
+prune an exact search: a person reached at depth d is dropped when
+d + lower(person, t) exceeds the best known upper bound.
+"""
+import struct
+import sys
+import time
+from array import array
+
+import degrees
+
+MAGIC = b"LANDMRK\x01"
+HEADER = struct.Struct("<8sII")
+
+# Stored distance for people a landmark cannot reach
+UNREACHABLE = 255
+
+INFINITY = float("inf")
+
+
+class LandmarkIndex():
+    """
+    Distances from K landmarks to every person, one byte per entry.
+    """
+
+    def __init__(self, person_ids, landmarks, distances):
+        self.person_ids = person_ids
+        self.landmarks = landmarks
+        # distances[k][i] is the distance from landmark k to person i
+        self.distances = distances
+        self.index = {person_id: i for i, person_id in enumerate(person_ids)}
+
+    @classmethod
+    def build(cls, k=16):
+        """
+        Builds an index over the data loaded by degrees.load_data,
+        using the k people with the most co-stars as landmarks.
+        """
+        person_ids = sorted(degrees.people)
+        index = {person_id: i for i, person_id in enumerate(person_ids)}
+        by_degree = sorted(
+            person_ids,
+            key=lambda person_id: len(degrees.costars_for_person(person_id)),
+            reverse=True,
+        )
+
+        landmarks = []
+        distances = []
+        for landmark in by_degree[:k]:
+            row = array("B", [UNREACHABLE]) * len(person_ids)
+            for person_id, distance, _, _ in degrees.reachable(landmark, UNREACHABLE - 1):
+                row[index[person_id]] = distance
+            landmarks.append(landmark)
+            distances.append(row)
+        return cls(person_ids, landmarks, distances)
+
+    def save(self, filename):
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self.landmarks), len(self.person_ids)))
+            for ids in (self.landmarks, self.person_ids):
+                blob = "\n".join(ids).encode("utf-8")
+                f.write(struct.pack("<Q", len(blob)))
+                f.write(blob)
+            for row in self.distances:
+                f.write(bytes(row))
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, "rb") as f:
+            data = f.read()
+        magic, k, n = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise Exception("not a landmark index")
+        position = HEADER.size
+        ids = []
+        for _ in range(2):
+            length, = struct.unpack_from("<Q", data, position)
+            position += 8
+            blob = data[position:position + length].decode("utf-8")
+            ids.append(blob.split("\n") if blob else [])
+            position += length
+        landmarks, person_ids = ids
+        distances = []
+        for _ in range(k):
+            distances.append(memoryview(data)[position:position + n])
+            position += n
+        return cls(person_ids, landmarks, distances)
+
+    def profile(self, person_id):
+        """
+        Returns the distances from every landmark to a person.
+        """
+        i = self.index[person_id]
+        return [row[i] for row in self.distances]
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the degrees of separation between
+        two people. Both are infinite if they are provably not connected;
+        upper is infinite if no landmark reaches both.
+        """
+        if source == target:
+            return 0, 0
+        return _bounds(self.profile(source), self.profile(target))
+
+
+def _bounds(source_profile, target_profile):
+    lower, upper = 1, INFINITY
+    for a, b in zip(source_profile, target_profile):
+        if a == UNREACHABLE and b == UNREACHABLE:
+            continue
+        if a == UNREACHABLE or b == UNREACHABLE:
+            # One of them shares the landmark's component, the other does not
+            return INFINITY, INFINITY
+        lower = max(lower, abs(a - b))
+        upper = min(upper, a + b)
+    return lower, upper
+
+
+def shortest_path(index, source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, skipping everyone the landmark
+    bounds rule out.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+    target_profile = index.profile(target)
+    lower, upper = _bounds(index.profile(source), target_profile)
+    if lower == INFINITY:
+        return None
+
+    parents = {source: None}
+    layer = [source]
+    depth = 0
+    while layer and depth < upper:
+        depth += 1
+        next_layer = []
+        for person in layer:
+            for movie, neighbor in degrees.costars_for_person(person):
+                if neighbor in parents:
+                    continue
+                if neighbor == target:
+                    parents[neighbor] = (movie, person)
+                    return _backtrack(parents, target)
+                remaining, _ = _bounds(index.profile(neighbor), target_profile)
+                if depth + remaining > upper:
+                    continue
+                parents[neighbor] = (movie, person)
+                next_layer.append(neighbor)
+        layer = next_layer
+    return None
+
+
+def _backtrack(parents, person):
+    path = []
+    while parents[person] is not None:
+        movie, parent = parents[person]
+        path.append((movie, person))
+        person = parent
+    path.reverse()
+    return path
+
+
+def main():
+    if len(sys.argv) not in [2, 3, 4]:
+        sys.exit("Usage: python landmarks.py directory [index file] [k]")
+    directory = sys.argv[1]
+    filename = sys.argv[2] if len(sys.argv) >= 3 else f"{directory}/landmarks.bin"
+    k = int(sys.argv[3]) if len(sys.argv) == 4 else 16
+
+    print("Loading data...")
+    degrees.load_data(directory)
+    print("Data loaded.")
+
+    start = time.perf_counter()
+    index = LandmarkIndex.build(k)
+    index.save(filename)
+    elapsed = time.perf_counter() - start
+    print(f"Indexed {len(index.person_ids)} people from "
+          f"{len(index.landmarks)} landmarks in {elapsed:.1f}s: {filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Streaming loader for the degrees dataset.
+
+Fills the same `names`, `people` and `movies` dictionaries as
+degrees.load_data, but reads each CSV file in chunks of whole lines,
+reporting rows per second and estimated time left as it goes. Chunks can
+be parsed by a pool of worker processes; their rows are merged into the
+dictionaries in file order by the parent.
+
+Chunks are split at line breaks, so quoted fields must not span lines,
+which holds for the IMDb exports this project uses.
+"""
+import csv
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import degrees
+
+CHUNK_SIZE = 4 * 2**20
+
+
+def chunk_ranges(filename, chunk_size=CHUNK_SIZE):
+    """
+    Returns the header fields and the (start, end) byte ranges of chunks
+    of whole lines after the header.
+    """
+    ranges = []
+    with open(filename, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]))
+        start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def parse_chunk(filename, start, end, columns):
+    """
+    Returns the rows of one chunk as tuples of the given column indices.
+    """
+    with open(filename, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    return [tuple(row[i] for i in columns) for row in csv.reader(io.StringIO(text)) if row]
+
+
+class Progress():
+    """
+    Prints rows per second and estimated time left for one file.
+    """
+
+    def __init__(self, label, total_bytes, stream=sys.stderr, interval=0.5):
+        self.label = label
+        self.total_bytes = total_bytes
+        self.stream = stream
+        self.interval = interval
+        self.rows = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self.reported = 0.0
+
+    def update(self, rows, nbytes):
+        self.rows += rows
+        self.bytes += nbytes
+        now = time.perf_counter()
+        if now - self.reported >= self.interval or self.bytes >= self.total_bytes:
+            self.reported = now
+            self.report(now)
+
+    def report(self, now):
+        elapsed = max(now - self.started, 1e-9)
+        rate = self.rows / elapsed
+        done = self.bytes / self.total_bytes if self.total_bytes else 1.0
+        left = elapsed * (1 - done) / done if done else 0.0
+        self.stream.write(
+            f"\r{self.label}: {done:6.1%} {self.rows} rows, "
+            f"{rate:,.0f} rows/s, {left:.0f}s left "
+        )
+        if self.bytes >= self.total_bytes:
+            self.stream.write("\n")
+        self.stream.flush()
+
+
+def add_person(data, row):
+    person_id, name, birth = row
+    data.people[person_id] = {
+        "name": name,
+        "birth": birth,
+        "movies": set()
+    }
+    data.names.setdefault(name.lower(), set()).add(person_id)
+
+
+def add_movie(data, row):
+    movie_id, title, year = row
+    data.movies[movie_id] = {
+        "title": title,
+        "year": year,
+        "stars": set()
+    }
+
+
+def add_star(data, row):
+    person_id, movie_id = row
+    try:
+        data.people[person_id]["movies"].add(movie_id)
+        data.movies[movie_id]["stars"].add(person_id)
+    except KeyError:
+        pass
+
+
+# File, columns read from it, and how each row is merged
+FILES = (
+    ("people.csv", ("id", "name", "birth"), add_person),
+    ("movies.csv", ("id", "title", "year"), add_movie),
+    ("stars.csv", ("person_id", "movie_id"), add_star),
+)
+
+
+def iter_load(directory, workers=0, chunk_size=CHUNK_SIZE, progress=True,
+              data=degrees):
+    """
+    Loads data chunk by chunk, yielding (filename, rows so far) after each
+    chunk is merged. The dictionaries of `data`, the degrees module by
+    default, can be queried between steps; once people and movies are in,
+    each step adds more stars.
+    """
+    pool = ProcessPoolExecutor(workers) if workers else None
+    try:
+        for name, fields, add in FILES:
+            filename = os.path.join(directory, name)
+            header, ranges = chunk_ranges(filename, chunk_size)
+            columns = [header.index(field) for field in fields]
+            total = sum(end - start for start, end in ranges)
+            tracker = Progress(name, total,
+                               stream=sys.stderr if progress else io.StringIO())
+
+            arguments = [(filename, start, end, columns) for start, end in ranges]
+            if pool is None:
+                chunks = (parse_chunk(*args) for args in arguments)
+            else:
+                chunks = pool.map(parse_chunk, *zip(*arguments)) if arguments else []
+
+            for (start, end), rows in zip(ranges, chunks):
+                for row in rows:
+                    add(data, row)
+                # Neighbor caches go stale as soon as the graph grows
+                data.neighbor_cache.clear()
+                data.costar_cache.clear()
+                tracker.update(len(rows), end - start)
+                yield name, tracker.rows
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def load_data(directory, workers=0, chunk_size=CHUNK_SIZE, progress=True,
+              data=degrees):
+    """
+    Load data from CSV files into memory, reporting progress.
+    """
+    data.neighbor_cache.clear()
+    data.costar_cache.clear()
+    for _ in iter_load(directory, workers, chunk_size, progress, data):
+        pass
@@ -0,0 +1,93 @@
+"""
+Prefix and fuzzy name lookup for degrees.
+
+NameIndex keeps the distinct lowercase names of degrees.names sorted, so
+prefix queries are a bisection, and maps every character trigram to the
+names containing it, so misspelled names are ranked by trigram overlap
+instead of scanning everyone.
+"""
+from bisect import bisect_left
+from collections import Counter
+
+import degrees
+
+
+def trigrams(text):
+    """
+    Returns the set of character trigrams of a padded, lowercase string.
+    """
+    text = f"  {text.lower()} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex():
+
+    def __init__(self, names=None):
+        if names is None:
+            names = degrees.names
+        # Lowercase name -> set of person_ids, as degrees.names
+        self.name_map = names
+        self.names = sorted(names)
+        self.grams = {}
+        self.sizes = []
+        for i, name in enumerate(self.names):
+            grams = trigrams(name)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.grams.setdefault(gram, []).append(i)
+
+    def prefix(self, text, limit=10):
+        """
+        Returns up to `limit` names starting with `text`, in order.
+        """
+        text = text.lower()
+        found = []
+        i = bisect_left(self.names, text)
+        while i < len(self.names) and len(found) < limit and self.names[i].startswith(text):
+            found.append(self.names[i])
+            i += 1
+        return found
+
+    def fuzzy(self, text, limit=10, threshold=0.3):
+        """
+        Returns up to `limit` (score, name) pairs ranked by the Dice
+        similarity of their trigrams with `text`, best first.
+        """
+        grams = trigrams(text)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.grams.get(gram, ()))
+
+        ranked = []
+        for i, count in shared.items():
+            score = 2 * count / (len(grams) + self.sizes[i])
+            if score >= threshold:
+                ranked.append((score, self.names[i]))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return ranked[:limit]
+
+    def candidates(self, text, limit=10):
+        """
+        Returns ranked candidate names for a query: the exact name if
+        known, then prefix matches, then fuzzy matches.
+        """
+        text = text.lower()
+        found = []
+        if text in self.name_map:
+            found.append(text)
+        for name in self.prefix(text, limit):
+            if name not in found:
+                found.append(name)
+        for _, name in self.fuzzy(text, limit):
+            if name not in found:
+                found.append(name)
+        return found[:limit]
+
+    def resolve(self, text, policy="most_connected", birth=None):
+        """
+        Returns the person_id best matching a possibly misspelled name,
+        without asking the user, or None.
+        """
+        for name in self.candidates(text, limit=1):
+            return degrees.choose_person(list(self.name_map[name]), policy, birth)
+        return None
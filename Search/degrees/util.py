@@ -1,3 +1,7 @@
+import sys
+from collections import OrderedDict, deque
+
+
 class Node():
     def __init__(self, state, parent, action):
         #state == people
@@ -10,24 +14,37 @@ class Node():
 
 class StackFrontier():
     def __init__(self):
-        self.frontier = []
+        # Nodes kept in a deque so both ends pop in O(1)
+        self.frontier = deque()
+        # Count of nodes per state, so contains_state is a hash lookup
+        self.states = {}
 
     def add(self, node):
         self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
 
+    def __len__(self):
+        return len(self.frontier)
+
+    def _forget(self, node):
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+        return node
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
-            return node
+            return self._forget(self.frontier.pop())
 
 
 class QueueFrontier(StackFrontier):
@@ -36,6 +53,74 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
+            return self._forget(self.frontier.popleft())
+
+
+class LRUCache():
+    """
+    Least-recently-used cache bounded by an estimated size in bytes.
+
+    `sizeof` estimates the memory held by a value; the oldest entries are
+    evicted whenever the total goes over `max_bytes`.
+    """
+
+    def __init__(self, max_bytes, sizeof=sys.getsizeof):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, compute):
+        """
+        Returns the cached value for `key`, calling `compute(key)` on a miss.
+        """
+        try:
+            value, _ = self.entries[key]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return value
+
+        value = compute(key)
+        size = self.sizeof(value)
+        if size <= self.max_bytes:
+            self.entries[key] = (value, size)
+            self.bytes += size
+            self._evict()
+        return value
+
+    def resize(self, max_bytes):
+        """
+        Sets the memory cap, evicting the oldest entries at once
+        until the cache fits under it.
+        """
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def _evict(self):
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        """Empties the cache and resets its statistics."""
+        self.entries.clear()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
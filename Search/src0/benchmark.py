@@ -0,0 +1,166 @@
+"""
+Benchmarks every maze solver on generated mazes of increasing size.
+
+For each maze from generator.py and each strategy of Maze.solve, plus the
+array-backed GridMaze searches, reports states explored, peak frontier
+size, path length, wall time and peak traced memory, as a table or JSON.
+
+Run with --check to verify on random mazes that every shortest-path
+strategy finds paths as short as breadth-first search.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from generator import GENERATORS
+from maze import STRATEGIES, Maze
+
+
+def load(text):
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(text)
+    try:
+        return Maze(f.name)
+    finally:
+        os.remove(f.name)
+
+
+def check_optimal(trials=1000, seed=0):
+    """
+    Solves random mazes with random start and goal cells using every
+    shortest-path strategy and exits if any finds a longer path than
+    breadth-first search, or disagrees on whether a path exists.
+    """
+    rng = random.Random(seed)
+    solved = 0
+    for trial in range(trials):
+        height, width = rng.randint(3, 30), rng.randint(3, 30)
+        density = rng.choice([0.05, 0.2, 0.35])
+        rows = [["#" if rng.random() < density else " " for _ in range(width)]
+                for _ in range(height)]
+        cells = [(i, j) for i in range(height) for j in range(width)]
+        (si, sj), (gi, gj) = rng.sample(cells, 2)
+        rows[si][sj] = "A"
+        rows[gi][gj] = "B"
+        text = "\n".join("".join(row) for row in rows) + "\n"
+
+        lengths = {}
+        for strategy in OPTIMAL:
+            m = load(text)
+            try:
+                m.solve(strategy)
+                lengths[strategy] = len(m.solution[0])
+            except Exception:
+                lengths[strategy] = None
+        if len(set(lengths.values())) != 1:
+            sys.exit(f"Trial {trial}: path lengths differ: {lengths}")
+        solved += lengths["bfs"] is not None
+    print(f"{trials} mazes, {solved} solvable: all strategies optimal.")
+
+
+# Strategies that always find a shortest path
+OPTIMAL = ("bfs", "ucs", "astar", "wavefront", "jps")
+
+def solvers():
+    """
+    Returns (name, solve) pairs, where solve(filename) returns a solved maze.
+    """
+    def maze_solver(strategy):
+        def solve(filename):
+            m = Maze(filename)
+            m.solve(strategy)
+            return m
+        return solve
+
+    def grid_solver(strategy):
+        def solve(filename):
+            from gridmaze import GridMaze
+            m = GridMaze(filename)
+            m.solve(strategy)
+            return m
+        return solve
+
+    found = [(strategy, maze_solver(strategy)) for strategy in STRATEGIES]
+    found += [(f"grid-{strategy}", grid_solver(strategy)) for strategy in ("bfs", "dfs")]
+    return found
+
+
+def measure(solve, filename):
+    """
+    Solves a maze file twice, once for wall time and once under tracemalloc
+    for the peak memory, and returns the statistics as a dict.
+    """
+    started = time.perf_counter()
+    m = solve(filename)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    solve(filename)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "explored": m.num_explored,
+        "max_frontier": getattr(m, "max_frontier", None),
+        "length": len(m.solution[0]),
+        "seconds": round(elapsed, 6),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run(kinds, sizes, seed=0):
+    """
+    Yields one result dict per generated maze and solver.
+    """
+    names = solvers()
+    for kind in kinds:
+        for size in sizes:
+            text = GENERATORS[kind](size, size, seed)
+            with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+                f.write(text)
+            try:
+                for name, solve in names:
+                    result = {"maze": kind, "size": size, "solver": name}
+                    result.update(measure(solve, f.name))
+                    yield result
+            finally:
+                os.remove(f.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every maze solver.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 51, 101, 201])
+    parser.add_argument("--kinds", nargs="+", choices=GENERATORS, default=list(GENERATORS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    parser.add_argument("--check", action="store_true",
+                        help="only verify that shortest-path strategies are optimal")
+    args = parser.parse_args()
+
+    if args.check:
+        check_optimal(seed=args.seed)
+        return
+
+    # Import NumPy before timing anything
+    import numpy
+
+    results = run(args.kinds, args.sizes, args.seed)
+    if args.json:
+        print(json.dumps(list(results), indent=2))
+        return
+
+    print(f"{'maze':<12} {'size':>5} {'solver':<10} {'explored':>9} "
+          f"{'frontier':>9} {'length':>7} {'seconds':>9} {'peak KiB':>10}")
+    for r in results:
+        frontier = "-" if r["max_frontier"] is None else r["max_frontier"]
+        print(f"{r['maze']:<12} {r['size']:>5} {r['solver']:<10} {r['explored']:>9} "
+              f"{frontier:>9} {r['length']:>7} {r['seconds']:>9.4f} {r['peak_kib']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Seeded maze generators, writing the same text format maze.py reads.
+
+"backtracker" carves a perfect maze with an iterative recursive
+backtracker (long winding corridors), "prim" carves one with randomized
+Prim's algorithm (many short dead ends), "rooms" scatters obstacles
+over one open room, and "sparse" is a room with only a few of them.
+The start is placed near the top-left corner and the goal near the
+bottom-right one.
+"""
+import random
+import sys
+from collections import deque
+
+WALL = "#"
+OPEN = " "
+
+
+def _grid(height, width, fill):
+    return [[fill] * width for _ in range(height)]
+
+
+def _cell_size(height, width):
+    # Perfect mazes carve cells on odd coordinates inside a wall border
+    height = max(height, 3) | 1
+    width = max(width, 3) | 1
+    return height, width
+
+
+def _text(grid):
+    return "\n".join("".join(row) for row in grid) + "\n"
+
+
+def _place(grid, start, goal):
+    grid[start[0]][start[1]] = "A"
+    grid[goal[0]][goal[1]] = "B"
+    return _text(grid)
+
+
+def backtracker(height, width, seed=0):
+    """
+    Returns a perfect maze carved by a depth-first recursive backtracker.
+    """
+    rng = random.Random(seed)
+    height, width = _cell_size(height, width)
+    grid = _grid(height, width, WALL)
+
+    stack = [(1, 1)]
+    grid[1][1] = OPEN
+    while stack:
+        row, col = stack[-1]
+        options = [
+            (row + dr, col + dc, row + dr // 2, col + dc // 2)
+            for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+            if 0 < row + dr < height - 1 and 0 < col + dc < width - 1
+            and grid[row + dr][col + dc] == WALL
+        ]
+        if not options:
+            stack.pop()
+            continue
+        r, c, wall_r, wall_c = rng.choice(options)
+        grid[wall_r][wall_c] = OPEN
+        grid[r][c] = OPEN
+        stack.append((r, c))
+
+    return _place(grid, (1, 1), (height - 2, width - 2))
+
+
+def prim(height, width, seed=0):
+    """
+    Returns a perfect maze grown by randomized Prim's algorithm.
+    """
+    rng = random.Random(seed)
+    height, width = _cell_size(height, width)
+    grid = _grid(height, width, WALL)
+
+    def add_walls(row, col):
+        for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2)):
+            r, c = row + dr, col + dc
+            if 0 < r < height - 1 and 0 < c < width - 1 and grid[r][c] == WALL:
+                walls.append((r, c, row + dr // 2, col + dc // 2))
+
+    grid[1][1] = OPEN
+    walls = []
+    add_walls(1, 1)
+    while walls:
+        # Swap a random wall to the end, so removal is O(1)
+        i = rng.randrange(len(walls))
+        walls[i], walls[-1] = walls[-1], walls[i]
+        r, c, wall_r, wall_c = walls.pop()
+        if grid[r][c] == WALL:
+            grid[wall_r][wall_c] = OPEN
+            grid[r][c] = OPEN
+            add_walls(r, c)
+
+    return _place(grid, (1, 1), (height - 2, width - 2))
+
+
+def rooms(height, width, seed=0, density=0.2):
+    """
+    Returns an open room with randomly placed single-cell obstacles,
+    retrying with derived seeds until the goal is reachable.
+    """
+    height, width = max(height, 3), max(width, 3)
+    start, goal = (1, 1), (height - 2, width - 2)
+    for attempt in range(1000):
+        rng = random.Random(seed * 1000 + attempt)
+        grid = _grid(height, width, OPEN)
+        for row in range(height):
+            for col in range(width):
+                border = row in (0, height - 1) or col in (0, width - 1)
+                if border or rng.random() < density:
+                    grid[row][col] = WALL
+        grid[start[0]][start[1]] = OPEN
+        grid[goal[0]][goal[1]] = OPEN
+        if _connected(grid, start, goal):
+            return _place(grid, start, goal)
+    raise Exception("could not generate a solvable room")
+
+
+def sparse(height, width, seed=0):
+    """
+    Returns an open room with obstacles on about 1% of its cells.
+    """
+    return rooms(height, width, seed, density=0.01)
+
+
+def _connected(grid, start, goal):
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        row, col = queue.popleft()
+        if (row, col) == goal:
+            return True
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if grid[r][c] == OPEN and (r, c) not in seen:
+                seen.add((r, c))
+                queue.append((r, c))
+    return False
+
+
+GENERATORS = {
+    "backtracker": backtracker,
+    "prim": prim,
+    "rooms": rooms,
+    "sparse": sparse,
+}
+
+
+def main():
+    if len(sys.argv) not in [5, 6] or sys.argv[1] not in GENERATORS:
+        sys.exit(f"Usage: python generator.py {'|'.join(GENERATORS)} "
+                 "height width output.txt [seed]")
+    kind, height, width, filename = sys.argv[1:5]
+    seed = int(sys.argv[5]) if len(sys.argv) == 6 else 0
+    with open(filename, "w") as f:
+        f.write(GENERATORS[kind](int(height), int(width), seed))
+
+
+if __name__ == "__main__":
+    main()
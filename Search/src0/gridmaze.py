@@ -0,0 +1,195 @@
+"""
+Array-backed maze for very large grids.
+
+GridMaze reads the same maze files as maze.Maze, but keeps the walls as a
+NumPy bit array (one bit per cell, packed with numpy.packbits) and
+addresses cells by flat index, row * width + col. The file is read a
+line at a time and packed eight rows at a time, so loading never holds
+more than the packed walls and one block of rows. Searching keeps one byte
+per cell for the direction it was reached from and a packed explored
+bitmap, instead of Node objects and a set of (row, col) tuples, so a
+10k x 10k maze needs about 140 MB instead of many gigabytes.
+"""
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+# Direction codes stored per reached cell; 0 means not reached yet
+UP, DOWN, LEFT, RIGHT = 1, 2, 3, 4
+ACTIONS = {UP: "up", DOWN: "down", LEFT: "left", RIGHT: "right"}
+
+
+class Bitmap():
+    """
+    Fixed-size set of flat cell indices, one bit per cell.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.bits = bytearray((size + 7) // 8)
+
+    def add(self, i):
+        self.bits[i >> 3] |= 0x80 >> (i & 7)
+
+    def __contains__(self, i):
+        return self.bits[i >> 3] & (0x80 >> (i & 7)) != 0
+
+    def __len__(self):
+        return int(np.unpackbits(np.frombuffer(self.bits, dtype=np.uint8)).sum())
+
+    def to_array(self, shape):
+        """Returns the bitmap as a NumPy bool array of the given shape."""
+        flat = np.unpackbits(np.frombuffer(self.bits, dtype=np.uint8), count=self.size)
+        return flat.astype(bool).reshape(shape)
+
+
+def _find_all(line, char):
+    col = line.find(char)
+    while col != -1:
+        yield col
+        col = line.find(char, col + 1)
+
+
+class GridMaze():
+
+    def __init__(self, filename):
+
+        # Scan the file once for its size, start and goal, so the walls
+        # can be packed without ever holding the whole text
+        self.height = 0
+        self.width = 0
+        starts, goals = [], []
+        with open(filename) as f:
+            for row, line in enumerate(f):
+                line = line.rstrip("\n")
+                self.height += 1
+                self.width = max(self.width, len(line))
+                starts.extend((row, col) for col in _find_all(line, "A"))
+                goals.extend((row, col) for col in _find_all(line, "B"))
+        self.size = self.height * self.width
+
+        # Validate start and goal
+        if len(starts) != 1:
+            raise Exception("maze must have exactly one start point")
+        if len(goals) != 1:
+            raise Exception("maze must have exactly one goal")
+        self.start = starts[0]
+        self.goal = goals[0]
+
+        # Keep track of walls, packed eight cells to a byte. Eight rows
+        # always fill a whole number of bytes, so each block of rows is
+        # packed straight into its place in the preallocated buffer
+        wall_bits = bytearray((self.size + 7) // 8)
+        block = np.zeros((8, self.width), dtype=bool)
+        with open(filename) as f:
+            for row, line in enumerate(f):
+                text = line.rstrip("\n").ljust(self.width)
+                cells = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+                block[row % 8] = (cells != ord(" ")) & (cells != ord("A")) & (cells != ord("B"))
+                if row % 8 == 7 or row == self.height - 1:
+                    rows = row % 8 + 1
+                    packed = np.packbits(block[:rows])
+                    offset = (row - rows + 1) * self.width // 8
+                    wall_bits[offset:offset + len(packed)] = packed.tobytes()
+        self.wall_bits = wall_bits
+
+        self.solution = None
+
+    @property
+    def walls(self):
+        """Walls as a NumPy bool array of shape (height, width)."""
+        flat = np.unpackbits(np.frombuffer(self.wall_bits, dtype=np.uint8), count=self.size)
+        return flat.astype(bool).reshape(self.height, self.width)
+
+    def is_wall(self, i):
+        return self.wall_bits[i >> 3] & (0x80 >> (i & 7)) != 0
+
+    def index(self, state):
+        row, col = state
+        return row * self.width + col
+
+    def neighbors(self, i):
+        """
+        Returns (direction, index) pairs for the open cells next to index i.
+        """
+        width = self.width
+        col = i % width
+        result = []
+        if i >= width and not self.is_wall(i - width):
+            result.append((UP, i - width))
+        if i + width < self.size and not self.is_wall(i + width):
+            result.append((DOWN, i + width))
+        if col > 0 and not self.is_wall(i - 1):
+            result.append((LEFT, i - 1))
+        if col < width - 1 and not self.is_wall(i + 1):
+            result.append((RIGHT, i + 1))
+        return result
+
+    def solve(self, strategy="bfs"):
+        """
+        Finds a solution to maze, if one exists, by breadth-first ("bfs")
+        or depth-first ("dfs") search. Sets `solution` to (actions, cells)
+        as maze.Maze does, plus `num_explored`, `explored` and `elapsed`.
+        """
+        if strategy not in ("bfs", "dfs"):
+            raise ValueError(f"unknown strategy: {strategy}")
+        started = time.perf_counter()
+
+        start = self.index(self.start)
+        goal = self.index(self.goal)
+
+        # Direction each cell was reached from, doubling as the frontier test
+        came_from = bytearray(self.size)
+        self.explored = Bitmap(self.size)
+        self.num_explored = 0
+
+        frontier = deque([start])
+        remove = frontier.popleft if strategy == "bfs" else frontier.pop
+        reached = False
+        while frontier:
+            i = remove()
+            self.num_explored += 1
+            if i == goal:
+                reached = True
+                break
+            self.explored.add(i)
+            for direction, j in self.neighbors(i):
+                if j != start and not came_from[j]:
+                    came_from[j] = direction
+                    frontier.append(j)
+
+        self.elapsed = time.perf_counter() - started
+        if not reached:
+            raise Exception("no solution")
+        self.solution = self._backtrack(came_from, start, goal)
+
+    def _backtrack(self, came_from, start, goal):
+        # Step back against each stored direction
+        steps = {UP: self.width, DOWN: -self.width, LEFT: 1, RIGHT: -1}
+        actions = []
+        cells = []
+        i = goal
+        while i != start:
+            direction = came_from[i]
+            actions.append(ACTIONS[direction])
+            cells.append(divmod(i, self.width))
+            i += steps[direction]
+        actions.reverse()
+        cells.reverse()
+        return actions, cells
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python gridmaze.py maze1.txt [bfs|dfs]")
+    m = GridMaze(sys.argv[1])
+    m.solve(sys.argv[2] if len(sys.argv) == 3 else "bfs")
+    print("States Explored:", m.num_explored)
+    print("Solution Length:", len(m.solution[0]))
+    print(f"Time: {m.elapsed:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,54 @@
+import argparse
+import heapq
+import json
+import os
 import sys
+import time
+from collections import deque
+from itertools import chain
 
 class Node():
-    def __init__(self, state, parent, action):
+    def __init__(self, state, parent, action, cost=0):
         self.state = state
         self.parent = parent
         self.action = action
+        # Number of steps from the start
+        self.cost = cost
 
 
 class StackFrontier():
     def __init__(self):
-        self.frontier = []
+        # Nodes kept in a deque so both ends pop in O(1)
+        self.frontier = deque()
+        # Count of nodes per state, so contains_state is a hash lookup
+        self.states = {}
 
     def add(self, node):
         self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
 
+    def __len__(self):
+        return len(self.frontier)
+
+    def _forget(self, node):
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+        return node
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
-            return node
+            return self._forget(self.frontier.pop())
 
 
 class QueueFrontier(StackFrontier):
@@ -35,9 +57,101 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
+            return self._forget(self.frontier.popleft())
+
+
+class PriorityFrontier():
+    """
+    Binary heap of nodes, removing the lowest priority first.
+
+    A state can be added again with a cheaper path; the stale heap entry
+    is skipped when it comes up instead of being searched for.
+    """
+
+    def __init__(self):
+        self.frontier = []
+        # Cheapest known cost of each state waiting in the frontier
+        self.costs = {}
+        # Tie breaker, so nodes themselves are never compared
+        self.counter = 0
+
+    def add(self, node, priority):
+        heapq.heappush(self.frontier, (priority, self.counter, node))
+        self.counter += 1
+        self.costs[node.state] = node.cost
+
+    def contains_state(self, state):
+        return state in self.costs
+
+    def cost(self, state):
+        return self.costs[state]
+
+    def empty(self):
+        return len(self.costs) == 0
+
+    def __len__(self):
+        return len(self.costs)
+
+    def remove(self):
+        while self.frontier:
+            _, _, node = heapq.heappop(self.frontier)
+            if self.costs.get(node.state) == node.cost:
+                del self.costs[node.state]
+                return node
+        raise Exception("empty frontier")
+
+
+# Search strategies accepted by Maze.solve
+STRATEGIES = ("dfs", "bfs", "greedy", "astar", "ucs", "wavefront", "jps")
+
+# Unit step for each action
+MOVES = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+# Palette indices used by Maze.output_image, and the color of each
+BORDER, EMPTY, EXPLORED, SOLUTION, GOAL, START, WALL = range(7)
+PALETTE = [(0, 0, 0), (237, 240, 252), (212, 97, 85), (220, 235, 113),
+           (0, 171, 28), (255, 0, 0), (40, 40, 40)]
+
+
+def _jump_along(open_cells, stops, step):
+    """
+    Returns, for every cell of a 2-D grid, the column of the first stop
+    cell met moving along its row in direction `step` (1 or -1), or -1
+    when a wall or the edge of the grid comes first.
+    """
+    import numpy as np
+
+    width = open_cells.shape[1]
+    columns = np.arange(width)
+    # Walls end a jump as well as stops do; find the next such event
+    events = stops | ~open_cells
+    if step == 1:
+        marked = np.where(events, columns, width)
+        following = np.minimum.accumulate(marked[:, ::-1], axis=1)[:, ::-1]
+        following = np.concatenate(
+            [following[:, 1:], np.full((len(marked), 1), width)], axis=1)
+        inside = following < width
+    else:
+        marked = np.where(events, columns, -1)
+        following = np.maximum.accumulate(marked, axis=1)
+        following = np.concatenate(
+            [np.full((len(marked), 1), -1), following[:, :-1]], axis=1)
+        inside = following >= 0
+    rows = np.arange(len(marked))[:, None]
+    found = inside & stops[rows, np.clip(following, 0, width - 1)]
+    return np.where(found, following, -1)
+
+
+def _cell_indices(cells):
+    """
+    Returns (rows, cols) NumPy index arrays for a collection of (row, col)
+    cells, read straight into one array rather than unpacked as arguments.
+    """
+    import numpy as np
+
+    flat = np.fromiter(chain.from_iterable(cells), dtype=np.intp, count=2 * len(cells))
+    return flat[0::2], flat[1::2]
+
 
 class Maze():
 
@@ -116,15 +230,54 @@ class Maze():
         return result
 
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+    def manhattan(self, state):
+        """Manhattan distance from a state to the goal."""
+        return abs(state[0] - self.goal[0]) + abs(state[1] - self.goal[1])
+
+
+    def solve(self, strategy="dfs"):
+        """
+        Finds a solution to maze, if one exists.
+
+        `strategy` is one of STRATEGIES: depth-first ("dfs"), breadth-first
+        ("bfs"), greedy best-first ("greedy"), A* ("astar") or uniform-cost
+        ("ucs"). The last three use the Manhattan distance to the goal as
+        their heuristic where they need one. "wavefront" is a breadth-first
+        search that expands whole layers at once as NumPy index arrays.
+        "jps" is Jump Point Search, A* over the few cells where a shortest
+        path may have to turn, which suits open rooms with sparse walls.
+
+        Afterwards `num_explored`, `max_frontier` (peak frontier size) and
+        `elapsed` (seconds) describe the search. For "wavefront",
+        `num_explored` counts every cell reached, the goal's whole layer
+        included, rather than nodes expanded, so it reads at least as high
+        as "bfs".
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown strategy: {strategy}")
+        started = time.perf_counter()
+        try:
+            if strategy in ("dfs", "bfs"):
+                self._solve_uninformed(strategy)
+            elif strategy == "wavefront":
+                self._solve_wavefront()
+            elif strategy == "jps":
+                self._solve_jump_points()
+            else:
+                self._solve_best_first(strategy)
+        finally:
+            self.elapsed = time.perf_counter() - started
+
+
+    def _solve_uninformed(self, strategy):
 
         # Keep track of number of states explored
         self.num_explored = 0
+        self.max_frontier = 1
 
         # Initialize frontier to just the starting position
         start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
+        frontier = StackFrontier() if strategy == "dfs" else QueueFrontier()
         frontier.add(start)
 
         # Initialize an empty explored set
@@ -143,15 +296,7 @@ class Maze():
 
             # If node is the goal, then we have a solution
             if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
+                self._set_solution(node)
                 return
 
             # Mark node as explored
@@ -162,68 +307,436 @@ class Maze():
                 if not frontier.contains_state(state) and state not in self.explored:
                     child = Node(state=state, parent=node, action=action)
                     frontier.add(child)
+            self.max_frontier = max(self.max_frontier, len(frontier))
 
 
-    def output_image(self, filename, show_solution=True, show_explored=False):
-        from PIL import Image, ImageDraw
-        cell_size = 50
-        cell_border = 2
+    def _solve_best_first(self, strategy):
+        self.num_explored = 0
+        self.max_frontier = 1
 
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
+        # Priority of a node for each strategy, lowest is removed first
+        if strategy == "greedy":
+            priority = lambda node: self.manhattan(node.state)
+        elif strategy == "astar":
+            priority = lambda node: node.cost + self.manhattan(node.state)
+        else:
+            priority = lambda node: node.cost
 
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
+        start = Node(state=self.start, parent=None, action=None)
+        frontier = PriorityFrontier()
+        frontier.add(start, priority(start))
+        self.explored = set()
 
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
+        while True:
+            if frontier.empty():
+                raise Exception("no solution")
 
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
+            node = frontier.remove()
+            self.num_explored += 1
 
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
+            if node.state == self.goal:
+                self._set_solution(node)
+                return
 
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
+            self.explored.add(node.state)
 
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
+            # Add neighbors, or replace a frontier entry with a cheaper path
+            for action, state in self.neighbors(node.state):
+                if state in self.explored:
+                    continue
+                cost = node.cost + 1
+                if frontier.contains_state(state) and frontier.cost(state) <= cost:
+                    continue
+                child = Node(state=state, parent=node, action=action, cost=cost)
+                frontier.add(child, priority(child))
+            self.max_frontier = max(self.max_frontier, len(frontier))
+
+
+    def distance_field(self, stop_at_goal=True):
+        """
+        Returns a NumPy array of the number of steps from the start to every
+        cell, -1 where unreachable, filled one breadth-first layer at a time.
+        Each layer is an array of flat cell indices whose neighbors are
+        found with array arithmetic, so a layer costs time in proportion to
+        its size rather than to the whole grid. With `stop_at_goal` the
+        fill stops after the goal's layer, so cells farther from the start
+        than the goal are -1 too.
+        """
+        import numpy as np
+
+        # Pad the grid with a ring of walls so neighbors never leave it
+        height, width = self.height + 2, self.width + 2
+        open_cells = np.zeros((height, width), dtype=bool)
+        open_cells[1:-1, 1:-1] = ~np.array(self.walls, dtype=bool)
+        open_cells = open_cells.ravel()
+        distances = np.full(height * width, -1, dtype=np.int32)
+
+        start = (self.start[0] + 1) * width + self.start[1] + 1
+        goal = (self.goal[0] + 1) * width + self.goal[1] + 1
+        layer = np.array([start])
+        distances[start] = 0
+        steps = np.array([-width, width, -1, 1])
+
+        # Peak layer size stands in for the peak frontier of the other strategies
+        self.max_frontier = 1
+        depth = 0
+        while layer.size:
+            if stop_at_goal and distances[goal] >= 0:
+                break
+            depth += 1
+            grown = (layer[:, None] + steps).ravel()
+            grown = grown[open_cells[grown] & (distances[grown] < 0)]
+            layer = np.unique(grown)
+            distances[layer] = depth
+            self.max_frontier = max(self.max_frontier, int(layer.size))
+        return distances.reshape(height, width)[1:-1, 1:-1].copy()
+
+
+    def _solve_wavefront(self):
+        import numpy as np
+
+        distances = self.distance_field()
+        reached = distances >= 0
+        self.num_explored = int(reached.sum())
+        self.explored = set(map(tuple, np.argwhere(reached).tolist()))
+
+        if distances[self.goal] < 0:
+            raise Exception("no solution")
+
+        # Walk back from the goal, always to a cell one step closer
+        actions = []
+        cells = []
+        row, col = self.goal
+        while (row, col) != self.start:
+            cells.append((row, col))
+            depth = distances[row, col]
+            for action, (r, c) in (("down", (row - 1, col)), ("up", (row + 1, col)),
+                                   ("right", (row, col - 1)), ("left", (row, col + 1))):
+                if 0 <= r < self.height and 0 <= c < self.width and distances[r, c] == depth - 1:
+                    actions.append(action)
+                    row, col = r, c
+                    break
+        actions.reverse()
+        cells.reverse()
+        self.solution = (actions, cells)
+
+
+    def is_open(self, row, col):
+        return 0 <= row < self.height and 0 <= col < self.width and not self.walls[row][col]
+
+
+    def _jump_tables(self):
+        """
+        Returns, for each of the four moves, an array giving the column
+        (horizontal moves) or row (vertical moves) of the jump point found
+        by jumping that way from every cell, or -1 where the jump hits a
+        wall first. Built with NumPy in one pass over the grid, so every
+        jump during the search is a single lookup.
+        """
+        import numpy as np
+
+        height, width = self.height, self.width
+        padded = np.zeros((height + 2, width + 2), dtype=bool)
+        padded[1:-1, 1:-1] = ~np.array(self.walls, dtype=bool)
+        open_cells = padded[1:-1, 1:-1]
+        goal = np.zeros_like(open_cells)
+        goal[self.goal] = True
+
+        # A cell reached along a row is a jump point if it is the goal or
+        # has an open cell above or below whose predecessor in the row is
+        # walled; one reached along a column is one if it is the goal or a
+        # horizontal jump from it finds a jump point
+        above, below = padded[:-2, 1:-1], padded[2:, 1:-1]
+        forced_right = (above & ~padded[:-2, :-2]) | (below & ~padded[2:, :-2])
+        forced_left = (above & ~padded[:-2, 2:]) | (below & ~padded[2:, 2:])
+        right = _jump_along(open_cells, open_cells & (goal | forced_right), 1)
+        left = _jump_along(open_cells, open_cells & (goal | forced_left), -1)
+        turns = open_cells & (goal | (right >= 0) | (left >= 0))
+        down = _jump_along(open_cells.T, turns.T, 1).T
+        up = _jump_along(open_cells.T, turns.T, -1).T
+        return {(0, 1): right, (0, -1): left, (1, 0): down, (-1, 0): up}
+
+
+    def _jump_horizontal(self, row, col, dc):
+        """
+        Returns the first cell along the row from (row, col) that is the
+        goal or has a forced vertical neighbor (an open cell above or
+        below whose predecessor in the row is walled), or None at a wall.
+        """
+        found = int(self.jumps[(0, dc)][row, col])
+        return None if found < 0 else (row, found)
+
+
+    def _jump_vertical(self, row, col, dr):
+        """
+        Returns the first cell along the column from (row, col) that is
+        the goal or from which a horizontal jump finds a jump point,
+        or None at a wall.
+        """
+        found = int(self.jumps[(dr, 0)][row, col])
+        return None if found < 0 else (found, col)
+
+
+    def _jump_successors(self, node):
+        """
+        Returns the jump points reachable from a node, pruning directions
+        that a shortest path never needs to take from it.
+        """
+        row, col = node.state
+        if node.parent is None:
+            directions = list(MOVES.values())
+        else:
+            pr, pc = node.parent.state
+            dr = (row > pr) - (row < pr)
+            dc = (col > pc) - (col < pc)
+            if dr:
+                # Arrived vertically: keep going, or turn either way
+                directions = [(dr, 0), (0, -1), (0, 1)]
+            else:
+                # Arrived horizontally: keep going, or turn where forced
+                directions = [(0, dc)]
+                for turn in (-1, 1):
+                    if self.is_open(row + turn, col) and not self.is_open(row + turn, col - dc):
+                        directions.append((turn, 0))
+
+        successors = []
+        for dr, dc in directions:
+            if dr:
+                point = self._jump_vertical(row, col, dr)
+            else:
+                point = self._jump_horizontal(row, col, dc)
+            if point is not None:
+                successors.append(point)
+        return successors
+
+
+    def _solve_jump_points(self):
+        self.jumps = self._jump_tables()
+        self.num_explored = 0
+        self.max_frontier = 1
 
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
+        start = Node(state=self.start, parent=None, action=None)
+        frontier = PriorityFrontier()
+        frontier.add(start, self.manhattan(self.start))
+        self.explored = set()
 
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
+        while True:
+            if frontier.empty():
+                raise Exception("no solution")
+
+            node = frontier.remove()
+            self.num_explored += 1
+
+            if node.state == self.goal:
+                self._set_jump_solution(node)
+                return
+
+            self.explored.add(node.state)
+
+            # Jump points lie on a straight line from the node
+            for state in self._jump_successors(node):
+                if state in self.explored:
+                    continue
+                cost = node.cost + abs(state[0] - node.state[0]) + abs(state[1] - node.state[1])
+                if frontier.contains_state(state) and frontier.cost(state) <= cost:
+                    continue
+                child = Node(state=state, parent=node, action=None, cost=cost)
+                frontier.add(child, cost + self.manhattan(state))
+            self.max_frontier = max(self.max_frontier, len(frontier))
+
+
+    def _set_jump_solution(self, node):
+        # Fill in every cell of the straight runs between jump points
+        points = []
+        while node is not None:
+            points.append(node.state)
+            node = node.parent
+        points.reverse()
+
+        actions = []
+        cells = []
+        for (r1, c1), (r2, c2) in zip(points, points[1:]):
+            dr = (r2 > r1) - (r2 < r1)
+            dc = (c2 > c1) - (c2 < c1)
+            action = next(name for name, move in MOVES.items() if move == (dr, dc))
+            for step in range(1, abs(r2 - r1) + abs(c2 - c1) + 1):
+                actions.append(action)
+                cells.append((r1 + dr * step, c1 + dc * step))
+        self.solution = (actions, cells)
+
+
+    def _set_solution(self, node):
+        actions = []
+        cells = []
+        while node.parent is not None:
+            actions.append(node.action)
+            cells.append(node.state)
+            node = node.parent
+        actions.reverse()
+        cells.reverse()
+        self.solution = (actions, cells)
+
+
+    def output_image(self, filename, show_solution=True, show_explored=False,
+                     cell_size=50, cell_border=2):
+        """
+        Saves the maze as an image, marking every cell with a palette index
+        through NumPy masks and scaling the index grid up to `cell_size`
+        pixels per cell.
+        """
+        import numpy as np
+        from PIL import Image
+
+        # Index of each cell's color, painted from lowest to highest precedence
+        colors = np.full((self.height, self.width), EMPTY, dtype=np.uint8)
 
+        solution = self.solution[1] if self.solution is not None else None
+        if solution is not None and show_explored and self.explored:
+            rows, cols = _cell_indices(self.explored)
+            colors[rows, cols] = EXPLORED
+        if solution is not None and show_solution and solution:
+            rows, cols = _cell_indices(solution)
+            colors[rows, cols] = SOLUTION
+        colors[self.goal] = GOAL
+        colors[self.start] = START
+        colors[np.array(self.walls, dtype=bool)] = WALL
+
+        # Scale up, then black out the border around each cell
+        pixels = colors.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+        inside = np.zeros(cell_size, dtype=bool)
+        inside[cell_border:cell_size - cell_border + 1] = True
+        rows = np.tile(inside, self.height)
+        cols = np.tile(inside, self.width)
+        pixels[~rows, :] = BORDER
+        pixels[:, ~cols] = BORDER
+
+        img = Image.fromarray(pixels, "P")
+        img.putpalette([value for color in PALETTE for value in color])
         img.save(filename)
 
 
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze1.txt")
+def solve_file(filename, strategy="dfs"):
+    """
+    Loads and solves one maze file, returning the solved Maze.
+    """
+    m = Maze(filename)
+    m.solve(strategy)
+    return m
+
+
+def solve_to_dict(filename, strategy="dfs", image_directory=None, cell_size=50):
+    """
+    Solves one maze file and returns a JSON-serializable summary, saving
+    an image of the solution into `image_directory` if given. Errors are
+    reported in the summary, so one bad file does not stop a batch.
+    """
+    result = {"maze": filename, "strategy": strategy}
+    try:
+        m = solve_file(filename, strategy)
+    except Exception as e:
+        result["error"] = str(e)
+        return result
 
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+    result.update({
+        "actions": m.solution[0],
+        "length": len(m.solution[0]),
+        "explored": m.num_explored,
+        "max_frontier": m.max_frontier,
+        "seconds": m.elapsed,
+    })
+    if image_directory is not None:
+        name = os.path.splitext(os.path.basename(filename))[0] + ".png"
+        image = os.path.join(image_directory, name)
+        m.output_image(image, show_explored=True, cell_size=cell_size)
+        result["image"] = image
+    return result
+
+
+def looks_like_maze(filename, chunk_size=1 << 20):
+    """
+    Returns True if a file marks a start or a goal anywhere, read in
+    chunks so large mazes are never held whole.
+    """
+    with open(filename, errors="replace") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return False
+            if "A" in chunk or "B" in chunk:
+                return True
+
+
+def solve_directory(directory, output, strategy="dfs", workers=None,
+                    images=True, cell_size=50):
+    """
+    Solves every .txt maze in a directory across a process pool, writing
+    results.json and one image per maze into `output`. Files with no start
+    and no goal at all, such as requirements.txt, are skipped; a malformed
+    maze is still solved and recorded as an error in results.json.
+    Returns the list of per-maze summaries.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    filenames = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.endswith(".txt")
+    )
+    filenames = [filename for filename in filenames if looks_like_maze(filename)]
+    os.makedirs(output, exist_ok=True)
+    image_directory = output if images else None
+
+    with ProcessPoolExecutor(workers) as pool:
+        results = list(pool.map(
+            solve_to_dict,
+            filenames,
+            [strategy] * len(filenames),
+            [image_directory] * len(filenames),
+            [cell_size] * len(filenames),
+        ))
+
+    with open(os.path.join(output, "results.json"), "w") as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="maze.py batch", description="Solve a directory of mazes in parallel.")
+    parser.add_argument("directory")
+    parser.add_argument("--output", default="solutions")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="dfs")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cell-size", type=int, default=50)
+    parser.add_argument("--no-images", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = solve_directory(args.directory, args.output, args.strategy,
+                              args.workers, not args.no_images, args.cell_size)
+    solved = sum("error" not in result for result in results)
+    print(f"Solved {solved} of {len(results)} mazes, results in {args.output}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["batch"]:
+        return batch_main(argv[1:])
+
+    if len(argv) not in [1, 2] or (len(argv) == 2 and argv[1] not in STRATEGIES):
+        sys.exit(f"Usage: python maze.py maze1.txt [{'|'.join(STRATEGIES)}]\n"
+                 "       python maze.py batch directory [--output DIR] [--strategy S]")
+
+    m = Maze(argv[0])
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve(argv[1] if len(argv) == 2 else "dfs")
+    print("States Explored:", m.num_explored)
+    print("Peak Frontier:", m.max_frontier)
+    print(f"Time: {m.elapsed:.4f}s")
+    print("Solution:")
+    m.print()
+    m.output_image("maze.png", show_explored=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Bitboard Tic Tac Toe engine.
+
+A position is two 9-bit masks, one for X and one for O, with cell (i, j)
+stored in bit 3 * i + j. A win is one of eight line masks fully covered
+by one player's mask, so winner() is a handful of integer ANDs, and the
+search makes and unmakes moves by flipping bits instead of copying boards.
+"""
+
+X = "X"
+O = "O"
+EMPTY = None
+
+FULL = 0b111111111
+
+# Rows, columns and both diagonals
+LINES = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+)
+
+# Bit of every cell and cell of every bit
+BITS = {(i, j): 1 << (3 * i + j) for i in range(3) for j in range(3)}
+CELLS = {bit: cell for cell, bit in BITS.items()}
+
+
+# The eight rotations and reflections of the board, as cell maps
+SYMMETRIES = (
+    lambda i, j: (i, j),
+    lambda i, j: (j, 2 - i),
+    lambda i, j: (2 - i, 2 - j),
+    lambda i, j: (2 - j, i),
+    lambda i, j: (i, 2 - j),
+    lambda i, j: (2 - i, j),
+    lambda i, j: (j, i),
+    lambda i, j: (2 - j, 2 - i),
+)
+
+
+def _transform_table(symmetry):
+    table = []
+    for mask in range(FULL + 1):
+        moved = 0
+        for cell, bit in BITS.items():
+            if mask & bit:
+                moved |= BITS[symmetry(*cell)]
+        table.append(moved)
+    return table
+
+
+# TRANSFORMS[k][mask] is mask under symmetry k
+TRANSFORMS = tuple(_transform_table(symmetry) for symmetry in SYMMETRIES)
+
+
+def canonical(x, o):
+    """
+    Returns one key shared by a position and all its rotations and
+    reflections: the smallest (x << 9 | o) over the eight symmetries.
+    """
+    return min(table[x] << 9 | table[o] for table in TRANSFORMS)
+
+
+def has_line(mask):
+    for line in LINES:
+        if mask & line == line:
+            return True
+    return False
+
+
+class Board():
+    """
+    Immutable 3x3 board that still reads like a list of lists:
+    board[i][j] is X, O or EMPTY.
+    """
+
+    __slots__ = ("x", "o")
+
+    def __init__(self, x=0, o=0):
+        self.x = x
+        self.o = o
+
+    @classmethod
+    def from_rows(cls, rows):
+        x = o = 0
+        for i, row in enumerate(rows):
+            for j, cell in enumerate(row):
+                if cell == X:
+                    x |= BITS[(i, j)]
+                elif cell == O:
+                    o |= BITS[(i, j)]
+        return cls(x, o)
+
+    def cell(self, i, j):
+        bit = BITS[(i, j)]
+        if self.x & bit:
+            return X
+        if self.o & bit:
+            return O
+        return EMPTY
+
+    def __getitem__(self, i):
+        return tuple(self.cell(i, j) for j in range(3))
+
+    def __iter__(self):
+        return (self[i] for i in range(3))
+
+    def __len__(self):
+        return 3
+
+    def __eq__(self, other):
+        if not isinstance(other, Board):
+            try:
+                other = Board.from_rows(other)
+            except TypeError:
+                return NotImplemented
+        return self.x == other.x and self.o == other.o
+
+    def __hash__(self):
+        return hash((self.x, self.o))
+
+    def __repr__(self):
+        return f"Board({[list(row) for row in self]})"
+
+    def to_rows(self):
+        return [list(row) for row in self]
+
+
+# Kinds of value kept in a transposition table entry
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TranspositionTable():
+    """
+    Search results keyed by canonical position, each a (value, flag) pair:
+    EXACT values are the game value, LOWER and UPPER ones only bound it,
+    as an alpha-beta cutoff leaves them.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def store(self, key, value, flag):
+        self.entries[key] = (value, flag)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+def masks(board):
+    """
+    Returns the (x, o) masks of a Board or of a list-of-lists board.
+    """
+    if not isinstance(board, Board):
+        board = Board.from_rows(board)
+    return board.x, board.o
+
+
+class Position():
+    """
+    Mutable position for search, changed in place by make and unmake.
+    """
+
+    def __init__(self, x=0, o=0):
+        self.x = x
+        self.o = o
+        # Number of positions expanded by the searches below
+        self.nodes = 0
+
+    @property
+    def x_to_move(self):
+        return bin(self.x).count("1") == bin(self.o).count("1")
+
+    def moves(self):
+        """Bits of every empty cell, lowest first."""
+        empty = FULL & ~(self.x | self.o)
+        while empty:
+            bit = empty & -empty
+            yield bit
+            empty ^= bit
+
+    def make(self, bit):
+        if self.x_to_move:
+            self.x |= bit
+        else:
+            self.o |= bit
+
+    def unmake(self, bit):
+        self.x &= ~bit
+        self.o &= ~bit
+
+    def score(self):
+        """
+        Returns 1 if X has won, -1 if O has won, 0 for a draw,
+        or None while the game goes on.
+        """
+        if has_line(self.x):
+            return 1
+        if has_line(self.o):
+            return -1
+        if self.x | self.o == FULL:
+            return 0
+        return None
+
+    def value(self, table=None):
+        """
+        Returns the game value with perfect play, from X's point of view.
+        Values are looked up in and stored to the transposition `table`
+        if one is given.
+        """
+        if table is not None:
+            key = canonical(self.x, self.o)
+            entry = table.get(key)
+            if entry is not None:
+                return entry[0]
+
+        self.nodes += 1
+        score = self.score()
+        if score is not None:
+            return score
+
+        maximizing = self.x_to_move
+        best = -2 if maximizing else 2
+        for bit in list(self.moves()):
+            self.make(bit)
+            v = self.value(table)
+            self.unmake(bit)
+            if maximizing and v > best:
+                best = v
+            elif not maximizing and v < best:
+                best = v
+
+        if table is not None:
+            table.store(key, best, EXACT)
+        return best
+
+    def best_move(self, table=None):
+        """
+        Returns (bit, value) of an optimal move, or (None, score) if over.
+        """
+        score = self.score()
+        if score is not None:
+            return None, score
+
+        maximizing = self.x_to_move
+        best_bit, best = None, -2 if maximizing else 2
+        for bit in list(self.moves()):
+            self.make(bit)
+            v = self.value(table)
+            self.unmake(bit)
+            if (maximizing and v > best) or (not maximizing and v < best):
+                best_bit, best = bit, v
+        return best_bit, best
@@ -0,0 +1,123 @@
+"""
+Perfect-play opening book for Tic Tac Toe.
+
+Running this file enumerates every position reachable from the empty
+board through tictactoe.result, solves each one, and writes book.bin.
+The book is a direct-indexed table with one byte per (x, o) mask pair,
+x << 9 | o, holding the game value in the high nibble and the optimal
+move's cell in the low one, so a lookup is a single index. Unreachable
+entries are 0xFF, which lets zlib shrink the file to a few kilobytes.
+"""
+import os
+import zlib
+
+from bitboard import BITS, CELLS, Position, TranspositionTable, masks
+
+FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+SIZE = 1 << 18
+UNKNOWN = 0xFF
+
+# Book read by probe on first use; False if none has been built
+_book = None
+
+# Cell of each move number stored in the low nibble
+MOVES = sorted(BITS)
+NO_MOVE = 0xF
+
+
+def encode(value, cell):
+    move = NO_MOVE if cell is None else MOVES.index(cell)
+    return (value + 1) << 4 | move
+
+
+def decode(entry):
+    """
+    Returns (value, action) from a book entry; action is None at game end.
+    """
+    move = entry & 0xF
+    return (entry >> 4) - 1, None if move == NO_MOVE else MOVES[move]
+
+
+def positions():
+    """
+    Yields every distinct board reachable from the initial state.
+    """
+    # Imported here, as tictactoe imports this module to probe the book
+    import tictactoe
+
+    seen = set()
+    stack = [tictactoe.initial_state()]
+    while stack:
+        board = stack.pop()
+        if board in seen:
+            continue
+        seen.add(board)
+        yield board
+        if not tictactoe.terminal(board):
+            for action in tictactoe.actions(board):
+                stack.append(tictactoe.result(board, action))
+
+
+def build():
+    """
+    Returns the book as a bytearray of SIZE entries.
+    """
+    table = TranspositionTable()
+    book = bytearray([UNKNOWN]) * SIZE
+    for board in positions():
+        x, o = masks(board)
+        bit, value = Position(x, o).best_move(table)
+        book[x << 9 | o] = encode(value, CELLS[bit] if bit is not None else None)
+    return book
+
+
+def save(book, filename=FILENAME):
+    with open(filename, "wb") as f:
+        f.write(zlib.compress(bytes(book), 9))
+
+
+def load(filename=FILENAME):
+    """
+    Returns the book, or None if it has not been built.
+    """
+    try:
+        with open(filename, "rb") as f:
+            return zlib.decompress(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def lookup(book, board):
+    """
+    Returns (value, action) for a board, or None if it is not in the book.
+    """
+    x, o = masks(board)
+    entry = book[x << 9 | o]
+    if entry == UNKNOWN:
+        return None
+    return decode(entry)
+
+
+def probe(board):
+    """
+    Returns (value, action) for a board from book.bin, loaded once and
+    shared by every engine, or None if the board or the book is missing.
+    """
+    global _book
+    if _book is None:
+        _book = load() or False
+    if not _book:
+        return None
+    return lookup(_book, board)
+
+
+def main():
+    book = build()
+    save(book)
+    count = sum(entry != UNKNOWN for entry in book)
+    print(f"Solved {count} positions into {FILENAME} "
+          f"({os.path.getsize(FILENAME)} bytes).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Generalized m,n,k-game Player
+
+Same functions as tictactoeAlphaBeta_pruning (initial_state, player,
+actions, result, winner, terminal, utility, alphaBetaSearch), but for an
+m x n board won by k in a row, so 3,3,3 is Tic Tac Toe and 15,15,5 is
+gomoku.
+
+Every line of k cells is a "window". The board keeps how many X and O
+stones each window holds, updated in O(k) when a stone is placed or
+removed, which gives both win detection and a heuristic evaluation
+without rescanning the board. alphaBetaSearch runs iterative-deepening
+alpha-beta until its time budget is spent, ordering moves by killer
+moves and the history heuristic, and evaluates the heuristic at the
+depth cutoff.
+"""
+import math
+import time
+
+X = 'X'
+O = 'O'
+EMPTY = None
+
+# Score of a won position, before preferring faster wins
+WIN = 10 ** 9
+
+# Windows of each board shape, shared by every board of that shape
+_windows = {}
+
+
+def _build_windows(m, n, k):
+    windows = []
+    for i in range(m):
+        for j in range(n):
+            for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                if 0 <= end_i < m and 0 <= end_j < n:
+                    windows.append(tuple((i + di * s) * n + j + dj * s for s in range(k)))
+    cell_windows = [[] for _ in range(m * n)]
+    for w, window in enumerate(windows):
+        for cell in window:
+            cell_windows[cell].append(w)
+    return windows, cell_windows
+
+
+class Board():
+    """
+    m x n board, read as board[i][j] like a list of lists.
+    """
+
+    def __init__(self, m=3, n=3, k=3):
+        self.m = m
+        self.n = n
+        self.k = k
+        if (m, n, k) not in _windows:
+            _windows[(m, n, k)] = _build_windows(m, n, k)
+        self.windows, self.cell_windows = _windows[(m, n, k)]
+
+        self.cells = [EMPTY] * (m * n)
+        self.x_counts = [0] * len(self.windows)
+        self.o_counts = [0] * len(self.windows)
+        self.stones = {X: 0, O: 0}
+        self.history = []
+        self.won = None
+
+        # Heuristic value from X's point of view: an open window holding
+        # c stones of one player is worth 10 ** (c - 1) to that player
+        self.weights = [0] + [10 ** (c - 1) for c in range(1, k + 1)]
+        self.score = 0
+
+    def copy(self):
+        board = Board.__new__(Board)
+        board.__dict__.update(self.__dict__)
+        board.cells = self.cells[:]
+        board.x_counts = self.x_counts[:]
+        board.o_counts = self.o_counts[:]
+        board.stones = dict(self.stones)
+        board.history = self.history[:]
+        return board
+
+    def __getitem__(self, i):
+        return self.cells[i * self.n:(i + 1) * self.n]
+
+    def __len__(self):
+        return self.m
+
+    def turn(self):
+        return X if self.stones[X] == self.stones[O] else O
+
+    def full(self):
+        return self.stones[X] + self.stones[O] == self.m * self.n
+
+    def _value(self, w):
+        x, o = self.x_counts[w], self.o_counts[w]
+        if o == 0:
+            return self.weights[x]
+        if x == 0:
+            return -self.weights[o]
+        return 0
+
+    def make(self, cell):
+        """Places the next player's stone on a flat cell index."""
+        mover = self.turn()
+        counts = self.x_counts if mover == X else self.o_counts
+        self.cells[cell] = mover
+        self.stones[mover] += 1
+        self.history.append((cell, self.won))
+        for w in self.cell_windows[cell]:
+            self.score -= self._value(w)
+            counts[w] += 1
+            self.score += self._value(w)
+            if counts[w] == self.k:
+                self.won = mover
+
+    def unmake(self):
+        """Takes back the last stone placed."""
+        cell, won = self.history.pop()
+        mover = self.cells[cell]
+        counts = self.x_counts if mover == X else self.o_counts
+        for w in self.cell_windows[cell]:
+            self.score -= self._value(w)
+            counts[w] -= 1
+            self.score += self._value(w)
+        self.cells[cell] = EMPTY
+        self.stones[mover] -= 1
+        self.won = won
+
+    def candidates(self, radius=2):
+        """
+        Empty cells worth searching: on large boards only those within
+        `radius` of a stone, as play far from every stone is never urgent.
+        """
+        if self.m * self.n <= 25 or not self.history:
+            empty = [cell for cell, value in enumerate(self.cells) if value is EMPTY]
+            if self.history or len(empty) <= 25:
+                return empty
+            return [(self.m // 2) * self.n + self.n // 2]
+
+        near = set()
+        for cell, _ in self.history:
+            i, j = divmod(cell, self.n)
+            for r in range(max(0, i - radius), min(self.m, i + radius + 1)):
+                for c in range(max(0, j - radius), min(self.n, j + radius + 1)):
+                    if self.cells[r * self.n + c] is EMPTY:
+                        near.add(r * self.n + c)
+        return list(near)
+
+
+def initial_state(m=3, n=3, k=3):
+    """
+    Returns starting state of an m x n board won by k in a row.
+    """
+    return Board(m, n, k)
+
+def player(board):
+    """
+    Returns player who has the next turn on a board, or None if it is over.
+    """
+    if terminal(board):
+        return None
+    return board.turn()
+
+def actions(board):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    return {divmod(cell, board.n) for cell, value in enumerate(board.cells) if value is EMPTY}
+
+def result(board, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    i, j = action
+    cell = i * board.n + j
+    if board.cells[cell] is not EMPTY:
+        raise Exception('Position in use')
+    board = board.copy()
+    board.make(cell)
+    return board
+
+def winner(board):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    return board.won
+
+def terminal(board):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    return board.won is not None or board.full()
+
+def utility(board):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    if board.won == X:
+        return 1
+    if board.won == O:
+        return -1
+    return 0
+
+
+class Timeout(Exception):
+    pass
+
+
+class Search():
+    """
+    Iterative-deepening negamax alpha-beta on one board, searched in place.
+    """
+
+    def __init__(self, board, time_limit):
+        self.board = board
+        self.deadline = time.perf_counter() + time_limit
+        self.nodes = 0
+        # Two moves per ply that last caused a cutoff there
+        self.killers = {}
+        # Cutoff credit per move, across the whole search
+        self.history = {}
+
+    def ordered(self, moves, ply, first=None):
+        killers = self.killers.get(ply, ())
+        def priority(cell):
+            if cell == first:
+                return (0, 0)
+            if cell in killers:
+                return (1, 0)
+            return (2, -self.history.get(cell, 0))
+        return sorted(moves, key=priority)
+
+    def negamax(self, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise Timeout()
+
+        board = self.board
+        if board.won is not None:
+            # The previous move won, so the side to move has lost
+            return -(WIN - ply)
+        if board.full():
+            return 0
+        if depth == 0:
+            return board.score if board.turn() == X else -board.score
+
+        best = -math.inf
+        for cell in self.ordered(board.candidates(), ply):
+            board.make(cell)
+            try:
+                v = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake()
+            if v > best:
+                best = v
+            if v > alpha:
+                alpha = v
+            if alpha >= beta:
+                killers = self.killers.setdefault(ply, [])
+                if cell not in killers:
+                    killers.insert(0, cell)
+                    del killers[2:]
+                self.history[cell] = self.history.get(cell, 0) + depth * depth
+                break
+        return best
+
+    def root(self, depth, first):
+        """
+        Searches every root move to `depth`, returning (cell, value).
+        """
+        best_cell, best = None, -math.inf
+        alpha, beta = -math.inf, math.inf
+        for cell in self.ordered(self.board.candidates(), 0, first):
+            self.board.make(cell)
+            try:
+                v = -self.negamax(depth - 1, -beta, -alpha, 1)
+            finally:
+                self.board.unmake()
+            if v > best:
+                best_cell, best = cell, v
+            alpha = max(alpha, v)
+        return best_cell, best
+
+    def run(self, max_depth=None):
+        """
+        Deepens until time runs out, the game tree is exhausted or a forced
+        result is found, returning the best cell of the last full depth.
+        """
+        self.depth = 0
+        candidates = self.board.candidates()
+        if len(candidates) == 1:
+            # Nothing to choose between, so keep the time budget
+            return candidates[0]
+
+        remaining = self.board.m * self.board.n - len(self.board.history)
+        max_depth = remaining if max_depth is None else min(max_depth, remaining)
+        best_cell = None
+        for depth in range(1, max_depth + 1):
+            try:
+                cell, value = self.root(depth, best_cell)
+            except Timeout:
+                break
+            best_cell = cell
+            self.depth = depth
+            if abs(value) >= WIN - remaining:
+                break
+        if best_cell is None:
+            best_cell = candidates[0]
+        return best_cell
+
+
+def alphaBetaSearch(board, time_limit=1.0, max_depth=None):
+    """
+    Returns the best action found for the current player on the board
+    within `time_limit` seconds.
+    """
+    if terminal(board):
+        return None
+    search = Search(board.copy(), time_limit)
+    cell = search.run(max_depth)
+    return divmod(cell, board.n)
@@ -0,0 +1,140 @@
+"""
+Root-parallel alpha-beta search for Tic Tac Toe.
+
+The root moves of a position are handed out to a ProcessPoolExecutor,
+one task per move, and each worker searches its move with
+tictactoeAlphaBeta_pruning's maxValueAB/minValueAB. The best value found
+at the root so far is kept in shared memory: every task starts from it
+as its alpha (X to move) or beta (O to move) and raises or lowers it when
+its own move does better, so later tasks prune as the sequential search
+would. Running this file reports node counts and times for the
+sequential search and for 1..cpu_count workers.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bitboard
+import tictactoeAlphaBeta_pruning as ab
+
+# Best root value so far, a shared multiprocessing.Value set by worker_init
+bound = None
+
+
+def worker_init(shared_bound, use_table):
+    global bound
+    bound = shared_bound
+    ab.table = bitboard.TranspositionTable() if use_table else None
+
+
+def search_move(board, action, turn):
+    """
+    Returns (action, value, exact, nodes) for one root move. The value is
+    exact only if it beat the shared bound the move was searched with;
+    otherwise it is just a bound and the move cannot be the best one.
+    """
+    with bound.get_lock():
+        best = bound.value
+    ab.nodes = 0
+    if turn == ab.X:
+        value = ab.minValueAB(ab.result(board, action), best, ab.beta)
+        exact = value > best
+    else:
+        value = ab.maxValueAB(ab.result(board, action), ab.alpha, best)
+        exact = value < best
+
+    if exact:
+        with bound.get_lock():
+            if (turn == ab.X and value > bound.value) or (turn == ab.O and value < bound.value):
+                bound.value = value
+    return action, value, exact, ab.nodes
+
+
+def make_pool(workers, use_table=True):
+    """
+    Returns (pool, shared_bound) for parallel_search.
+    """
+    shared_bound = multiprocessing.Value("d", 0.0)
+    pool = ProcessPoolExecutor(workers, initializer=worker_init,
+                               initargs=(shared_bound, use_table))
+    return pool, shared_bound
+
+
+def parallel_search(board, pool, shared_bound):
+    """
+    Returns (action, nodes): an optimal action for the current player,
+    with the root moves searched across the pool, and the number of
+    positions the workers visited.
+    """
+    turn = ab.player(board)
+    if turn is None:
+        return None, 0
+    shared_bound.value = ab.alpha if turn == ab.X else ab.beta
+
+    futures = [pool.submit(search_move, board, action, turn)
+               for action in sorted(ab.actions(board))]
+    move, best, nodes = None, None, 0
+    for future in futures:
+        action, value, exact, searched = future.result()
+        nodes += searched
+        if not exact:
+            continue
+        if best is None or (turn == ab.X and value > best) or (turn == ab.O and value < best):
+            move, best = action, value
+    return move, nodes
+
+
+def sequential(board, use_table):
+    ab.opening_book = False
+    ab.table = bitboard.TranspositionTable() if use_table else None
+    ab.nodes = 0
+    started = time.perf_counter()
+    ab.alphaBetaSearch(board)
+    return ab.nodes, time.perf_counter() - started
+
+
+def parallel(board, workers, use_table):
+    pool, shared_bound = make_pool(workers, use_table)
+    try:
+        # Start every worker before timing
+        list(pool.map(math.sqrt, range(workers)))
+        started = time.perf_counter()
+        _, nodes = parallel_search(board, pool, shared_bound)
+        return nodes, time.perf_counter() - started
+    finally:
+        pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and root-parallel alpha-beta.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="largest number of worker processes to try")
+    parser.add_argument("--table", action="store_true",
+                        help="use a transposition table in every search")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    board = ab.initial_state()
+    nodes, elapsed = sequential(board, args.table)
+    rows = [{"workers": 0, "nodes": nodes, "seconds": elapsed, "speedup": 1.0}]
+    for workers in range(1, args.workers + 1):
+        nodes, seconds = parallel(board, workers, args.table)
+        rows.append({"workers": workers, "nodes": nodes, "seconds": seconds,
+                     "speedup": elapsed / seconds})
+
+    if args.json:
+        print(json.dumps({"cores": os.cpu_count(), "results": rows}, indent=2))
+        return
+    print(f"Cores: {os.cpu_count()}")
+    print(f"{'workers':>8} {'nodes':>10} {'seconds':>10} {'speedup':>8}")
+    for row in rows:
+        workers = row["workers"] or "seq"
+        print(f"{workers:>8} {row['nodes']:>10} {row['seconds']:>10.4f} {row['speedup']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import pygame
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # import tictactoe as ttt
 import tictactoeAlphaBeta_pruning as ttt
@@ -18,14 +20,47 @@ mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
 moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
+# Seconds the computer appears to think, even when its move is instant
+thinking_delay = 0.5
+
 user = None
 board = ttt.initial_state()
-ai_turn = False
+
+# The AI searches on a worker thread so the window keeps drawing;
+# ai_move is its pending future, ai_started when it was submitted and
+# ai_cancel the event that aborts it
+executor = ThreadPoolExecutor(max_workers=1)
+ai_move = None
+ai_started = None
+ai_cancel = None
+clock = pygame.time.Clock()
+
+
+def cancel_ai_move():
+    """
+    Abandons the pending AI search: it never starts if still queued, and
+    a search already running stops at the next position it visits.
+    """
+    global ai_move
+    if ai_move is not None:
+        ai_cancel.set()
+        ai_move.cancel()
+        ai_move = None
+
+
+def reset():
+    global user, board
+    cancel_ai_move()
+    user = None
+    board = ttt.initial_state()
+
 
 while True:
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            cancel_ai_move()
+            executor.shutdown(wait=False)
             sys.exit()
 
     screen.fill(black)
@@ -103,7 +138,8 @@ while True:
         elif user == player:
             title = f"Play as {user}"
         else:
-            title = f"Computer thinking..."
+            dots = int(time.time() * 3) % 3 + 1
+            title = f"Computer thinking" + "." * dots
         title = largeFont.render(title, True, white)
         titleRect = title.get_rect()
         titleRect.center = ((width / 2), 30)
@@ -111,13 +147,13 @@ while True:
 
         # Check for AI move
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.alphaBetaSearch(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+            if ai_move is None:
+                ai_cancel = threading.Event()
+                ai_move = executor.submit(ttt.alphaBetaSearch, board, ai_cancel)
+                ai_started = time.time()
+            elif ai_move.done() and time.time() - ai_started >= thinking_delay:
+                board = ttt.result(board, ai_move.result())
+                ai_move = None
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
@@ -128,6 +164,21 @@ while True:
                     if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
                         board = ttt.result(board, (i, j))
 
+        # Reset the game, abandoning any search in progress
+        if not game_over:
+            resetButton = pygame.Rect(width - 110, height - 50, 100, 40)
+            resetText = mediumFont.render("Reset", True, black)
+            resetRect = resetText.get_rect()
+            resetRect.center = resetButton.center
+            pygame.draw.rect(screen, white, resetButton)
+            screen.blit(resetText, resetRect)
+            click, _, _ = pygame.mouse.get_pressed()
+            if click == 1:
+                mouse = pygame.mouse.get_pos()
+                if resetButton.collidepoint(mouse):
+                    time.sleep(0.2)
+                    reset()
+
         if game_over:
             againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
             again = mediumFont.render("Play Again", True, black)
@@ -140,8 +191,7 @@ while True:
                 mouse = pygame.mouse.get_pos()
                 if againButton.collidepoint(mouse):
                     time.sleep(0.2)
-                    user = None
-                    board = ttt.initial_state()
-                    ai_turn = False
+                    reset()
 
     pygame.display.flip()
+    clock.tick(60)
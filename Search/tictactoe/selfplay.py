@@ -0,0 +1,182 @@
+"""
+Headless self-play benchmark for the Tic Tac Toe engines.
+
+Plays games from seeded openings (a few random plies from the empty
+board) between tictactoe.minimax, tictactoeAlphaBeta_pruning's
+alphaBetaSearch and a random player, then prints JSON with moves per
+second, positions searched per move and transposition table hit rates
+for each engine. Every move is searched unless --book is given, in which
+case the engines answer from the opening book where it has the position.
+
+Every result is checked against the opening's game value: games between
+two engines must end with exactly that value, and an engine playing the
+random player must do at least as well as that value for its side.
+Disagreements are listed in the output and make the exit status 1, so a
+CI job fails on them.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+import tictactoe
+import tictactoeAlphaBeta_pruning as ab
+from bitboard import Position, TranspositionTable, masks
+
+# Module of each engine, holding its search function, `table` and `nodes`
+ENGINES = {
+    "minimax": (tictactoe, tictactoe.minimax),
+    "alphabeta": (ab, ab.alphaBetaSearch),
+}
+
+RANDOM = "random"
+
+
+class Stats():
+    """
+    Moves made by one engine and what they cost.
+    """
+
+    def __init__(self):
+        self.moves = 0
+        self.seconds = 0.0
+        self.nodes = 0
+
+    def to_dict(self, table):
+        result = {
+            "moves": self.moves,
+            "seconds": round(self.seconds, 6),
+            "moves_per_second": round(self.moves / self.seconds, 1) if self.seconds else None,
+            "nodes_per_move": round(self.nodes / self.moves, 2) if self.moves else None,
+        }
+        if table is not None:
+            stats = table.stats()
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+            result["table"] = stats
+        return result
+
+
+def opening(seed, plies):
+    """
+    Returns the board after up to `plies` random moves chosen by `seed`,
+    stopping early if the game ends.
+    """
+    rng = random.Random(seed)
+    board = tictactoe.initial_state()
+    for _ in range(plies):
+        if tictactoe.terminal(board):
+            break
+        action = rng.choice(sorted(tictactoe.actions(board)))
+        board = tictactoe.result(board, action)
+    return board
+
+
+def move(name, board, stats, rng):
+    """
+    Returns the action the named engine, or the random player, picks.
+    """
+    if name == RANDOM:
+        return rng.choice(sorted(tictactoe.actions(board)))
+    module, search = ENGINES[name]
+    before = module.nodes
+    started = time.perf_counter()
+    action = search(board.to_rows())
+    stats[name].seconds += time.perf_counter() - started
+    stats[name].moves += 1
+    stats[name].nodes += module.nodes - before
+    return action
+
+
+def play(board, x, o, stats, rng):
+    """
+    Plays out a game with engine `x` as X and `o` as O, returning its
+    utility.
+    """
+    while not tictactoe.terminal(board):
+        name = x if tictactoe.player(board) == tictactoe.X else o
+        board = tictactoe.result(board, move(name, board, stats, rng))
+    return tictactoe.utility(board)
+
+
+def matchups():
+    """
+    Yields (x, o) for every pairing of two engines and of one engine with
+    the random player.
+    """
+    for x in ENGINES:
+        for o in ENGINES:
+            yield x, o
+    for name in ENGINES:
+        yield name, RANDOM
+        yield RANDOM, name
+
+
+def run(openings, plies, seed, use_book=False, use_table=True):
+    """
+    Plays every matchup from `openings` seeded openings, returning the
+    report as a dictionary.
+    """
+    for module, _ in ENGINES.values():
+        module.opening_book = use_book
+        module.table = TranspositionTable() if use_table else None
+        module.nodes = 0
+    stats = {name: Stats() for name in ENGINES}
+    reference = TranspositionTable()
+    rng = random.Random(seed)
+
+    games = 0
+    mismatches = []
+    started = time.perf_counter()
+    for i in range(openings):
+        board = opening(seed + i, plies)
+        value = Position(*masks(board)).value(reference)
+        for x, o in matchups():
+            outcome = play(board, x, o, stats, rng)
+            games += 1
+            if RANDOM not in (x, o):
+                agrees = outcome == value
+            elif o == RANDOM:
+                agrees = outcome >= value
+            else:
+                agrees = outcome <= value
+            if not agrees:
+                mismatches.append({"opening": board.to_rows(), "x": x, "o": o,
+                                   "value": value, "outcome": outcome})
+
+    return {
+        "openings": openings,
+        "plies": plies,
+        "seed": seed,
+        "book": use_book,
+        "games": games,
+        "seconds": round(time.perf_counter() - started, 6),
+        "engines": {name: stats[name].to_dict(ENGINES[name][0].table) for name in ENGINES},
+        "agree": not mismatches,
+        "mismatches": mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Tic Tac Toe engines by self-play.")
+    parser.add_argument("--openings", type=int, default=100,
+                        help="number of seeded openings to play every matchup from")
+    parser.add_argument("--plies", type=int, default=2,
+                        help="random moves played to make each opening")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--book", action="store_true",
+                        help="answer moves from the opening book instead of searching")
+    parser.add_argument("--no-table", action="store_true",
+                        help="search without transposition tables")
+    args = parser.parse_args()
+
+    report = run(args.openings, args.plies, args.seed,
+                 use_book=args.book, use_table=not args.no_table)
+    print(json.dumps(report, indent=2))
+    if not report["agree"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,33 @@ import math
 from sys import getrecursionlimit
 from random import sample
 
+import book
+from bitboard import EXACT, LOWER, UPPER, TranspositionTable, canonical, has_line, masks
+
 X = 'X'
 O = 'O'
 EMPTY = None
+
+# Window every search starts from at the root
 alpha = float('-inf')
 beta = float('inf')
 
+# Bounds found by earlier searches, keyed by canonical board; None disables it
+table = TranspositionTable()
+
+# Number of positions visited by maxValueAB and minValueAB
+nodes = 0
+
+# Event that aborts the running alphaBetaSearch once set, or None
+cancel_event = None
+
+# Answer from the opening book (book.bin) when it has been built;
+# False to always search
+opening_book = True
+
+class Cancelled(Exception):
+    pass
+
 def initial_state():
     """
     Returns starting state of the board.
@@ -62,118 +83,15 @@ def result(board, action):
     
     return board_copy
     
-def resultO(board,i, j, empty_home):
-    if i == 0 and j == 0:
-        if board[i][j] == 'O':
-            if not (i, j+1) in empty_home and not (i, j+2) in empty_home:
-                if board[i][j+1] == 'O' and board[i][j+2] == 'O':
-                    return 'O'
-                    
-            if not (i+1, j) in empty_home and not (i+2, j) in empty_home:
-                if board[i+1][j] == 'O' and board[i+2][j] == 'O':
-                    return 'O'
-                    
-            if not (i+1, i+1) in empty_home and not (i+2, i+2) in empty_home:
-                if board[i+1][i+1] == 'O' and board[i+2][i+2] == 'O':
-                    return 'O'
-    
-    if i == 1 and j == 0:
-        if board[i][j] == 'O':
-            if not (i, j+1) in empty_home and not (i, j+2) in empty_home:
-                if board[i][j+1] == 'O' and board[i][j+2] == 'O':
-                    return 'O'
-                            
-    if i == 2 and j == 0:
-        if board[i][j] == 'O':
-            if not (i, j+1) in empty_home and not (i, j+2) in empty_home:
-                if board[i][j+1] == 'O' and board[i][j+2] == 'O':
-                    return 'O'
-                    
-            if not (i-1, i-1) in empty_home and not (i-2, i) in empty_home:
-                if board[i-1][i-1] == 'O' and board[i-2][i] == 'O':
-                    return 'O'
-                
-    if i == 1 and j == 1:
-        if board[i][j] == 'X':
-            if not (i, j - 1) in empty_home and not (i, j+1) in empty_home:
-                if board[i][j-1] == 'X' and board[i][j+1] == 'X':
-                    return 'X'
-                
-            if not (i-1, j) in empty_home and not (i+1, j) in empty_home:
-                if board[i-1][j] == 'X' and board[i+1][j] == 'X':
-                    return 'X'
-    
-    if i == 0 and j == 2:
-        if board[i][j] == 'O':
-            if not (i+1, j) in empty_home and not (i+2, j) in empty_home:
-                if board[i+1][j] == 'O' and board[i+2][j] == 'O':
-                    return 'O'
-    return None
-                    
-def resultX(board,i, j, empty_home):
-    if i == 0 and j == 0:
-        if board[i][j] == 'X':
-            if not (i, j+1) in empty_home and not (i, j+2) in empty_home:
-                if board[i][j+1] == 'X' and board[i][j+2] == 'X':
-                    return 'X'
-                    
-            if not (i+1, j) in empty_home and not (i+2, j) in empty_home:
-                if board[i+1][j] == 'X' and board[i+2][j] == 'X':
-                    return 'X'
-                    
-            if not (i+1, i+1) in empty_home and not (i+2, i+2) in empty_home:
-                if board[i+1][i+1] == 'X' and board[i+2][i+2] == 'X':
-                    return 'X'
-                    
-    if i == 1 and j == 0:
-        if board[i][j] == 'X':
-            if not (i, j+1) in empty_home and not (i, j+2) in empty_home:
-                if board[i][j+1] == 'X' and board[i][j+2] == 'X':
-                    return 'X'
-                            
-    if i == 2 and j == 0:
-        if board[i][j] == 'X':
-            if not (i, j+1) in empty_home and not (i, j+2) in empty_home:
-                if board[i][j+1] == 'X' and board[i][j+2] == 'X':
-                    return 'X'
-                    
-            if not (i-1, i-1) in empty_home and not (i-2, i) in empty_home:
-                if board[i-1][i-1] == 'X' and board[i-2][i] == 'X':
-                    return 'X'
-                    
-    if i == 1 and j == 1:
-        if board[i][j] == 'X':
-            if not (i, j - 1) in empty_home and not (i, j+1) in empty_home:
-                if board[i][j-1] == 'X' and board[i][j+1] == 'X':
-                    return 'X'
-                
-            if not (i-1, j) in empty_home and not (i+1, j) in empty_home:
-                if board[i-1][j] == 'X' and board[i+1][j] == 'X':
-                    return 'X'
-                
-    if i == 0 and j == 2:
-        if board[i][j] == 'X':
-            if not (i+1, j) in empty_home and not (i+2, j) in empty_home:
-                if board[i+1][j] == 'X' and board[i+2][j] == 'X':
-                    return 'X'
-    
-    return None
-
 def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
-    coordinate = [(0,0), (1,0), (2,0), (0,2), (1,1)]
-                              
-    for i,j in coordinate:
-        x = resultX(board, i, j, actions(board))
-        if x:
-            return x
-        
-        o = resultO(board, i, j, actions(board))
-        if o:
-            return o
-
+    x, o = masks(board)
+    if has_line(x):
+        return X
+    if has_line(o):
+        return O
     return None               
 
 def terminal(board):
@@ -199,50 +117,118 @@ def utility(board):
     
     return 0
 
+def lookup(board, alpha, beta):
+    """
+    Returns (key, value, alpha, beta) for a board from the transposition
+    table: value is set when the stored entry settles the search, otherwise
+    the window is narrowed by any stored bound.
+    """
+    if table is None:
+        return None, None, alpha, beta
+    key = canonical(*masks(board))
+    entry = table.get(key)
+    if entry is not None:
+        value, flag = entry
+        if flag == EXACT:
+            return key, value, alpha, beta
+        if flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return key, value, alpha, beta
+    return key, None, alpha, beta
+
+def store(key, v, alpha, beta):
+    """
+    Stores a value found with the (alpha, beta) window, flagged by whether
+    it is exact or only a bound.
+    """
+    if table is None:
+        return
+    if v <= alpha:
+        flag = UPPER
+    elif v >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    table.store(key, v, flag)
+
 def maxValueAB(board, alpha, beta):
+    global nodes
+    nodes += 1
+    if cancel_event is not None and cancel_event.is_set():
+        raise Cancelled()
     if terminal(board):
         return utility(board)
+    key, v, alpha, beta = lookup(board, alpha, beta)
+    if v is not None:
+        return v
+    start_alpha = alpha
     v = float('-inf')
     for action in actions(board):
         v = max(v, minValueAB(result(board, action), alpha, beta))
-        if v >= beta: return v
+        if v >= beta:
+            break
         alpha = max(alpha, v)
     
+    store(key, v, start_alpha, beta)
     return v
 
 def minValueAB(board, alpha, beta):
+    global nodes
+    nodes += 1
+    if cancel_event is not None and cancel_event.is_set():
+        raise Cancelled()
     if terminal(board):
         return utility(board)
+    key, v, alpha, beta = lookup(board, alpha, beta)
+    if v is not None:
+        return v
+    start_beta = beta
     v = float('inf')
     for action in actions(board):
         v = min(v, maxValueAB(result(board, action), alpha, beta))
-        if v <= alpha: return v
+        if v <= alpha:
+            break
         beta = min(beta, v)
     
+    store(key, v, alpha, start_beta)
     return v
 
-def alphaBetaSearch(board):
+def alphaBetaSearch(board, cancel=None):
     """
     Returns the optimal action for the current player on the board.
+    Raises Cancelled if the threading.Event `cancel` is set mid-search.
     """
+    global cancel_event
+    if opening_book:
+        entry = book.probe(board)
+        if entry is not None:
+            return entry[1]
+
     turn = player(board)
-    if turn == X:
-        v = float('-inf')
+    if turn is None:
+        return None
+
+    cancel_event = cancel
+    try:
+        # Each move's value tightens the window the remaining moves are
+        # searched with; a move that cannot beat it returns only a bound,
+        # which the strict comparisons below never pick
+        a, b = alpha, beta
         move = None
         for action in actions(board):
-            x = minValueAB(result(board, action), alpha, beta)
-            if x > v:
-                v = x
-                move = action
+            if turn == X:
+                x = minValueAB(result(board, action), a, b)
+                if x > a:
+                    a = x
+                    move = action
+            else:
+                x = maxValueAB(result(board, action), a, b)
+                if x < b:
+                    b = x
+                    move = action
         return move
-    
-    if turn == O:
-        v = float('inf')
-        move = None
-        for action in actions(board):
-            x = maxValueAB(result(board, action), alpha, beta)
-            if x < v:
-                v = x
-                move = action
-        
-        return move
\ No newline at end of file
+    finally:
+        cancel_event = None
@@ -0,0 +1,38 @@
+"""
+Reports how many positions minimax and alpha-beta search visit from the
+empty board with and without a transposition table.
+"""
+import bitboard
+import tictactoeAlphaBeta_pruning as ab
+
+
+def minimax_nodes(table):
+    position = bitboard.Position()
+    position.best_move(table)
+    return position.nodes
+
+
+def alpha_beta_nodes(table):
+    # Search every position instead of answering from the opening book
+    ab.opening_book = False
+    ab.table = table
+    ab.nodes = 0
+    ab.alphaBetaSearch(ab.initial_state())
+    return ab.nodes
+
+
+def main():
+    searches = [("minimax", minimax_nodes), ("alphaBetaSearch", alpha_beta_nodes)]
+    print(f"{'search':<16} {'no table':>10} {'table':>10} {'hits':>8} {'entries':>8}")
+    for name, count in searches:
+        before = count(None)
+        table = bitboard.TranspositionTable()
+        after = count(table)
+        stats = table.stats()
+        print(f"{name:<16} {before:>10} {after:>10} {stats['hits']:>8} {stats['entries']:>8}")
+    ab.table = bitboard.TranspositionTable()
+    ab.opening_book = True
+
+
+if __name__ == "__main__":
+    main()